@@ -0,0 +1,4 @@
+"""Benchmarks of the blinds_controller integration.
+
+Run from the repository root, e.g. `python -m benchmarks.calculator`.
+"""
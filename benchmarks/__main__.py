@@ -0,0 +1,31 @@
+"""Run the integration benchmarks and print one JSON object per run.
+
+    python -m benchmarks [--scenario move --count 50] [--latency 0.05]
+"""
+import argparse
+import json
+import logging
+import sys
+
+from . import scenarios
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--scenario", choices=sorted(scenarios.SCENARIOS), action="append")
+    parser.add_argument("--count", type=int, action="append", help="number of covers, repeatable")
+    parser.add_argument("--latency", type=float, default=0.02, help="switch service latency in seconds")
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    for name in args.scenario or scenarios.SCENARIOS:
+        for count in args.count or scenarios.SCENARIOS[name][1]:
+            result = scenarios.run(name, count, args.latency)
+            args.output.write(json.dumps(result) + "\n")
+            args.output.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Micro-benchmark of the TravelCalculator hot path.
+
+Measures how many position reads, and how many full sets of the reads done by
+one state write, a single calculator serves per second while traveling. With
+`--baseline REV`, the calculator of that git revision is measured as well,
+for a before and after comparison.
+
+    python -m benchmarks.calculator --baseline 65acf0e
+"""
+import argparse
+import json
+import subprocess
+import sys
+import timeit
+import types
+
+from custom_components.blinds_controller.calculator import TravelCalculator, clock
+
+
+def _best_rate(func, number: int, repeat: int = 5) -> float:
+    """Return the best observed calls per second of `func`."""
+    return number / min(timeit.repeat(func, number=number, repeat=repeat))
+
+
+def load_calculator(revision: str) -> types.ModuleType:
+    """Load the calculator module of a git revision."""
+    source = subprocess.run(
+        ["git", "show", f"{revision}:custom_components/blinds_controller/calculator.py"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    module = types.ModuleType(f"calculator_{revision}")
+    exec(compile(source, f"{revision}:calculator.py", "exec"), module.__dict__)
+    return module
+
+
+def run(number: int = 200_000, calculator=TravelCalculator) -> dict:
+    """Run the benchmark on a calculator class and return calls per second."""
+    calc = calculator(30.0, 30.0, 0.5)
+    calc.set_position(0)
+    calc.start_travel(100)
+
+    def state_reads():
+        calc.current_position()
+        calc.is_closed()
+        calc.position_reached()
+        calc.is_traveling()
+
+    def state_write():
+        # What BlindsCover.async_write_ha_state does around its property reads,
+        # a calculator without pinning just ignores the attribute.
+        calc.pinned_time = clock()
+        state_reads()
+        calc.pinned_time = None
+
+    return {
+        "benchmark": "calculator",
+        "current_position_per_s": round(_best_rate(calc.current_position, number)),
+        "unpinned_state_reads_per_s": round(_best_rate(state_reads, number // 4)),
+        "state_writes_per_s": round(_best_rate(state_write, number // 4)),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.calculator")
+    parser.add_argument("--baseline", metavar="REV", help="git revision whose calculator to compare with")
+    args = parser.parse_args(argv)
+
+    result = run()
+    print(json.dumps(result))
+    if args.baseline:
+        baseline = run(calculator=load_calculator(args.baseline).TravelCalculator)
+        print(json.dumps({**baseline, "benchmark": "calculator_baseline", "revision": args.baseline}))
+        print(json.dumps({
+            "benchmark": "calculator_speedup",
+            **{key: round(result[key] / baseline[key], 2) for key in result if key.endswith("_per_s")},
+        }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
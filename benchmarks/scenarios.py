@@ -0,0 +1,801 @@
+"""Benchmark scenarios driving BlindsCover entities on the stand-in hass."""
+import asyncio
+import importlib
+import statistics
+import time
+
+from homeassistant.const import STATE_ON
+
+from .stub_hass import INTEGRATION, CountingEventLoop, StubConfigEntry, StubHass, VirtualClockEventLoop, install
+
+TRAVEL_TIME = 2.0
+TILT_TIME = 0.5
+
+
+def _entry_data(index: int, **overrides) -> dict:
+    data = {
+        "ent_name": f"Blind {index}",
+        "entity_up": f"switch.blind_{index}_up",
+        "entity_down": f"switch.blind_{index}_down",
+        "time_up": TRAVEL_TIME,
+        "time_down": TRAVEL_TIME,
+        "tilt_open": 0.0,
+        "tilt_closed": 0.0,
+        "startup_delay": 0.0,
+        "send_stop_at_end": True,
+    }
+    data.update(overrides)
+    return data
+
+
+class PhysicalBlind:
+    """Ground truth of one blind, moving while exactly one of its relays is on.
+
+    A run first turns the slats to the end of its direction, if the blind has
+    tilt, and only then moves the blind.
+    """
+
+    def __init__(self, loop, time_up: float, time_down: float, position: float, tilt_time: float = 0.0, tilt: float = 0.0):
+        self._loop = loop
+        self.time_up = time_up
+        self.time_down = time_down
+        self.tilt_time = tilt_time
+        self._position = position
+        self._tilt = tilt
+        self._updated = loop.time()
+        self.up = False
+        self.down = False
+
+    @property
+    def position(self) -> float:
+        self._advance()
+        return self._position
+
+    @property
+    def tilt(self) -> float:
+        self._advance()
+        return self._tilt
+
+    def _advance(self) -> None:
+        now = self._loop.time()
+        elapsed, self._updated = now - self._updated, now
+        if self.up == self.down:
+            return
+        sign = 1 if self.up else -1
+        if self.tilt_time:
+            end = 100.0 if self.up else 0.0
+            turning = min(elapsed, abs(end - self._tilt) / 100 * self.tilt_time)
+            self._tilt += sign * 100 * turning / self.tilt_time
+            elapsed -= turning
+        travel_time = self.time_up if self.up else self.time_down
+        self._position = min(max(self._position + sign * 100 * elapsed / travel_time, 0.0), 100.0)
+
+    def switch_changed(self, event) -> None:
+        self._advance()
+        on = event.data["new_state"].state == STATE_ON
+        if event.data["entity_id"].endswith("_up"):
+            self.up = on
+        else:
+            self.down = on
+
+
+class Bench:
+    """One stand-in hass with a number of blinds set up through the integration."""
+
+    def __init__(self, loop: CountingEventLoop, latency: float):
+        self.loop = loop
+        self.hass = StubHass(loop, latency)
+        install(self.hass)
+        self.covers = []
+
+    async def async_setup(self, count: int, group: int = 1, entry_ids=None, config=None, **overrides) -> None:
+        await self.hass.integration.async_setup(self.hass, config or {})
+        for index in range(count):
+            data = _entry_data(index, **overrides)
+            if group > 1:
+                # Covers of a group share their relays.
+                data["entity_up"] = f"switch.group_{index // group}_up"
+                data["entity_down"] = f"switch.group_{index // group}_down"
+            for switch_entity_id in (data["entity_up"], data["entity_down"]):
+                if self.hass.states.get(switch_entity_id) is None:
+                    self.hass.states.async_set(switch_entity_id, "off")
+            entry_id = entry_ids[index] if entry_ids else None
+            await self.hass.config_entries.async_add(StubConfigEntry(data, entry_id=entry_id))
+        await self.hass.async_block_till_done()
+        self.covers = [
+            entity for entity in self.hass.entities.values() if entity.entity_id.startswith("cover.")
+        ]
+
+    async def async_run(self, action, settle: float) -> dict:
+        """Run `action`, wait until nothing moves any more and collect the metrics."""
+        hass = self.hass
+        wakeups, writes, calls = self.loop.wakeups, hass.state_writes, hass.services.calls
+        hass.services.round_trips.clear()
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+
+        await action()
+        await asyncio.sleep(settle)
+        await hass.async_block_till_done()
+
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+        round_trips = hass.services.round_trips
+        overshoots = [
+            cover._last_stop_overshoot
+            for cover in self.covers
+            if getattr(cover, "_last_stop_overshoot", None) is not None
+        ]
+        return {
+            "covers": len(self.covers),
+            "wall_s": round(wall, 3),
+            "loop_wakeups": self.loop.wakeups - wakeups,
+            "loop_wakeups_per_s": round((self.loop.wakeups - wakeups) / wall, 1),
+            "state_writes": hass.state_writes - writes,
+            "state_writes_per_s": round((hass.state_writes - writes) / wall, 1),
+            "cpu_ms_per_cover": round(cpu * 1000 / max(len(self.covers), 1), 3),
+            "service_calls": hass.services.calls - calls,
+            "command_latency_ms_mean": round(statistics.fmean(round_trips) * 1000, 3) if round_trips else None,
+            "command_latency_ms_max": round(max(round_trips) * 1000, 3) if round_trips else None,
+            "stop_overshoot_ms_mean": round(statistics.fmean(overshoots) * 1000, 3) if overshoots else None,
+            "stop_overshoot_ms_max": round(max(overshoots) * 1000, 3) if overshoots else None,
+        }
+
+
+async def scenario_move(loop, count: int, latency: float) -> dict:
+    """Open `count` covers at once."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count)
+
+    async def action():
+        await asyncio.gather(*(cover.async_open_cover() for cover in bench.covers))
+
+    return await bench.async_run(action, TRAVEL_TIME + 0.5)
+
+
+async def scenario_long(loop, count: int, latency: float) -> dict:
+    """Move `count` covers with travel times of minutes to mid-travel, on a virtual clock."""
+    result = {}
+    for travel_time in (20.0, 60.0):
+        bench = Bench(loop, latency)
+        await bench.async_setup(count, time_up=travel_time, time_down=travel_time)
+        blinds = []
+        for cover in bench.covers:
+            blind = PhysicalBlind(loop, travel_time, travel_time, 0.0)
+            bench.hass.states.async_track(
+                cover.switch_entity_ids, blind.switch_changed
+            )
+            await cover.async_set_known_position(0)
+            blinds.append(blind)
+
+        async def action():
+            await asyncio.gather(*(cover.async_set_cover_position(position=50) for cover in bench.covers))
+
+        run = await bench.async_run(action, travel_time / 2 + 1.0)
+        prefix = f"travel_{int(travel_time)}s"
+        result[f"{prefix}_reported"] = sorted({cover.current_cover_position for cover in bench.covers})
+        result[f"{prefix}_physical_min"] = round(min(blind.position for blind in blinds), 2)
+        result[f"{prefix}_physical_max"] = round(max(blind.position for blind in blinds), 2)
+        result[f"{prefix}_overshoots_recorded"] = sum(
+            cover._last_stop_overshoot is not None for cover in bench.covers
+        )
+        result[f"{prefix}_stop_overshoot_ms_max"] = run["stop_overshoot_ms_max"]
+    return result
+
+
+async def scenario_faster_relay(loop, count: int, latency: float) -> dict:
+    """Close `count` covers, and move them to mid-travel, once their relays answer faster than estimated."""
+    result = {}
+    bench = Bench(loop, 0.08)
+    await bench.async_setup(count)
+    blinds = []
+    for cover in bench.covers:
+        blind = PhysicalBlind(loop, TRAVEL_TIME, TRAVEL_TIME, 0.0)
+        bench.hass.states.async_track(cover.switch_entity_ids, blind.switch_changed)
+        await cover.async_set_known_position(0)
+        blinds.append(blind)
+    # The latency estimates settle on 80 ms, then the relays answer in 10 ms.
+    for target in (100, 0, 100):
+        await asyncio.gather(*(cover.async_set_cover_position(position=target) for cover in bench.covers))
+        await asyncio.sleep(TRAVEL_TIME + 1.0)
+    bench.hass.services.latency = 0.01
+
+    moves = (
+        ("close", lambda cover: cover.async_close_cover()),
+        ("to_50", lambda cover: cover.async_set_cover_position(position=50)),
+    )
+    for name, move in moves:
+
+        async def action():
+            await asyncio.gather(*(move(cover) for cover in bench.covers))
+
+        await bench.async_run(action, TRAVEL_TIME + 1.0)
+        result[f"{name}_states"] = sorted({bench.hass.states.get(cover.entity_id).state for cover in bench.covers})
+        result[f"{name}_reported"] = sorted({cover.current_cover_position for cover in bench.covers})
+        result[f"{name}_physical_min"] = round(min(blind.position for blind in blinds), 2)
+        result[f"{name}_physical_max"] = round(max(blind.position for blind in blinds), 2)
+    return result
+
+
+async def scenario_tilt(loop, count: int, latency: float) -> dict:
+    """Move position and tilt of `count` covers."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count, tilt_open=TILT_TIME, tilt_closed=TILT_TIME)
+
+    async def action():
+        await asyncio.gather(*(cover.async_set_cover_tilt_position(tilt_position=100) for cover in bench.covers))
+        await asyncio.gather(*(cover.async_set_cover_position(position=60) for cover in bench.covers))
+
+    return await bench.async_run(action, TRAVEL_TIME + 0.5)
+
+
+async def scenario_plan(loop, count: int, latency: float) -> dict:
+    """Move `count` covers to position 40 and tilt 60, planned and as two separate moves."""
+    result = {}
+    for planned in (False, True):
+        bench = Bench(loop, latency)
+        await bench.async_setup(count, tilt_open=TILT_TIME, tilt_closed=TILT_TIME)
+
+        async def action():
+            if planned:
+                await asyncio.gather(*(cover.async_set_position_and_tilt(40, 60) for cover in bench.covers))
+                return
+            await asyncio.gather(*(cover.async_set_cover_position(position=40) for cover in bench.covers))
+            await asyncio.gather(*(cover.async_set_cover_tilt_position(tilt_position=60) for cover in bench.covers))
+
+        blinds = []
+        for cover in bench.covers:
+            blind = PhysicalBlind(loop, TRAVEL_TIME, TRAVEL_TIME, 0.0, TILT_TIME)
+            bench.hass.states.async_track(
+                cover.switch_entity_ids, blind.switch_changed
+            )
+            blinds.append(blind)
+
+        run = await bench.async_run(action, TRAVEL_TIME + 0.5)
+        prefix = "planned" if planned else "separate"
+        result[f"{prefix}_service_calls"] = run["service_calls"]
+        result[f"{prefix}_reported"] = sorted(
+            {(cover.current_cover_position, cover.current_cover_tilt_position) for cover in bench.covers}
+        )
+        # How far the reported values are from where the blinds physically are.
+        result[f"{prefix}_position_error_max"] = round(
+            max(abs(cover.current_cover_position - blind.position) for cover, blind in zip(bench.covers, blinds)), 1
+        )
+        result[f"{prefix}_tilt_error_max"] = round(
+            max(abs(cover.current_cover_tilt_position - blind.tilt) for cover, blind in zip(bench.covers, blinds)), 1
+        )
+    return result
+
+
+async def scenario_admission(loop, count: int, latency: float) -> dict:
+    """Close `count` covers at once, without limit and with at most a fifth running."""
+    result = {}
+    limit = max(count // 5, 1)
+    for limited in (False, True):
+        config = {"blinds_controller": {"max_running_motors": limit, "circuits": {"a": max(limit // 2, 1)}}}
+        bench = Bench(loop, latency)
+        await bench.async_setup(count, config=config if limited else None)
+        for index, cover in enumerate(bench.covers):
+            # Half of the covers share a weaker circuit, every fourth goes first.
+            cover._circuit = "a" if index % 2 else None
+            cover._priority = 1 if index % 4 == 0 else 0
+
+        blinds = []
+        peak = 0
+
+        def switch_changed(event, blind):
+            nonlocal peak
+            blind.switch_changed(event)
+            peak = max(peak, sum(other.up != other.down for other in blinds))
+
+        for cover in bench.covers:
+            blind = PhysicalBlind(loop, TRAVEL_TIME, TRAVEL_TIME, 100.0)
+            bench.hass.states.async_track(
+                cover.switch_entity_ids,
+                lambda event, blind=blind: switch_changed(event, blind),
+            )
+            await cover.async_set_known_position(100)
+            blinds.append(blind)
+
+        async def action():
+            await asyncio.gather(*(cover.async_close_cover() for cover in bench.covers))
+
+        started = loop.time()
+        run = await bench.async_run(action, TRAVEL_TIME * (count // limit + 1) + 0.5)
+        admission = bench.hass.data["blinds_controller"]["admission"]
+        prefix = "limited" if limited else "unlimited"
+        result[f"{prefix}_peak_motors"] = peak
+        result[f"{prefix}_max_queue_depth"] = admission.max_queue_depth
+        result[f"{prefix}_wait_s_mean"] = round(admission.wait.mean or 0.0, 3)
+        result[f"{prefix}_wait_s_max"] = round(admission.wait.max, 3)
+        result[f"{prefix}_first_priority_wait_s_max"] = round(
+            max(cover._metrics.admission_wait.max for cover in bench.covers[::4]), 3
+        )
+        result[f"{prefix}_done_s"] = round(
+            max(cover._relay_stopped_at for cover in bench.covers) - started, 3
+        ) if all(cover._relay_stopped_at for cover in bench.covers) else None
+        result[f"{prefix}_position_error_max"] = round(
+            max(abs(cover.current_cover_position - blind.position) for cover, blind in zip(bench.covers, blinds)), 1
+        )
+        result[f"{prefix}_service_calls"] = run["service_calls"]
+
+    # A wall switch pressed while a cover waits for its motor slot.
+    bench = Bench(loop, latency)
+    await bench.async_setup(2, config={"blinds_controller": {"max_running_motors": 1}})
+    first, queued = bench.covers
+    blind = PhysicalBlind(loop, TRAVEL_TIME, TRAVEL_TIME, 100.0)
+    bench.hass.states.async_track(queued.switch_entity_ids, blind.switch_changed)
+    for cover in bench.covers:
+        await cover.async_set_known_position(100)
+
+    async def action():
+        commands = [bench.hass.async_create_task(cover.async_close_cover()) for cover in bench.covers]
+        await asyncio.sleep(0.1)
+        bench.hass.states.async_set(queued._down_switch_entity_id, STATE_ON)
+        await asyncio.sleep(TRAVEL_TIME / 2)
+        # Halfway down, the cover must be tracking the blind.
+        result["queued_wall_switch_followed"] = queued._metrics.external_handled
+        result["queued_wall_switch_error_midway"] = round(abs(queued.current_cover_position - blind.position), 1)
+        await asyncio.gather(*commands)
+
+    await bench.async_run(action, TRAVEL_TIME + 0.5)
+    return result
+
+
+async def scenario_arrival(loop, count: int, latency: float) -> dict:
+    """Close `count` covers and wait for each to arrive, polling the state and through move_to_position."""
+    result = {}
+    for waiting in ("polling", "service"):
+        bench = Bench(loop, latency)
+        await bench.async_setup(count)
+        hass = bench.hass
+        for cover in bench.covers:
+            await cover.async_set_known_position(100)
+        lags = []
+        arrivals = {}
+
+        async def wait_polling(cover):
+            # What a wait_template re-evaluated on every state amounts to.
+            await cover.async_set_cover_position(position=0)
+            while hass.states.get(cover.entity_id).attributes.get("current_position") != 0:
+                await asyncio.sleep(0.1)
+            lags.append(loop.time() - arrivals[cover])
+
+        async def wait_service():
+            response = await hass.services.async_call(
+                "blinds_controller",
+                "move_to_position",
+                {"entity_id": [cover.entity_id for cover in bench.covers], "position": 0, "wait": True},
+                blocking=True,
+                return_response=True,
+            )
+            result["service_eta_s"] = sorted({item["eta"] for item in response.values()})[-1]
+            result["service_reached"] = all(item["reached"] for item in response.values())
+            lags.extend(loop.time() - arrivals[cover] for cover in bench.covers)
+
+        async def action():
+            if waiting == "polling":
+                waits = asyncio.gather(*(wait_polling(cover) for cover in bench.covers))
+            else:
+                waits = asyncio.ensure_future(wait_service())
+            # Once the relays confirmed, the arrivals are known.
+            await asyncio.sleep(TRAVEL_TIME / 4)
+            for cover in bench.covers:
+                arrivals[cover] = loop.time() + cover.travel_calc.time_to_target()
+            await waits
+
+        run = await bench.async_run(action, 0.0)
+        result[f"{waiting}_loop_wakeups"] = run["loop_wakeups"]
+        result[f"{waiting}_cpu_ms_per_cover"] = run["cpu_ms_per_cover"]
+        # How long after the computed arrival the waiter went on.
+        result[f"{waiting}_lag_ms_max"] = round(max(lags) * 1000, 1)
+    return result
+
+
+async def scenario_backends(loop, count: int, latency: float) -> dict:
+    """Open `count` covers whose relays are MQTT switches, through the switch services and through MQTT."""
+    result = {}
+    for backend in ("switch", "mqtt"):
+        bench = Bench(loop, latency)
+        broker = bench.hass.broker
+        relays = {
+            entity_id: broker.add_switch(entity_id)
+            for index in range(count)
+            for entity_id in (_entry_data(index)["entity_up"], _entry_data(index)["entity_down"])
+        }
+        config = {"blinds_controller": {"mqtt_relays": relays}} if backend == "mqtt" else None
+        await bench.async_setup(count, config=config)
+
+        async def action():
+            await asyncio.gather(*(cover.async_open_cover() for cover in bench.covers))
+
+        cpu_started = time.process_time()
+        run = await bench.async_run(action, TRAVEL_TIME + 0.5)
+        latencies = [cover._metrics.relay_latency for cover in bench.covers if cover._metrics.relay_latency.count]
+        result[f"{backend}_service_calls"] = run["service_calls"]
+        result[f"{backend}_publishes"] = broker.published
+        result[f"{backend}_relay_latency_ms_mean"] = round(
+            statistics.fmean(histogram.mean for histogram in latencies) * 1000, 3
+        )
+        result[f"{backend}_relay_latency_ms_max"] = round(max(histogram.max for histogram in latencies) * 1000, 3)
+        result[f"{backend}_cpu_ms_per_cover"] = round((time.process_time() - cpu_started) * 1000 / count, 3)
+        result[f"{backend}_loop_wakeups"] = run["loop_wakeups"]
+        result[f"{backend}_stop_overshoot_ms_max"] = run["stop_overshoot_ms_max"]
+    return result
+
+
+async def scenario_external(loop, count: int, latency: float) -> dict:
+    """Toggle the up switches of `count` covers from outside the integration."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count)
+
+    async def action():
+        for cover in bench.covers:
+            bench.hass.states.async_set(cover._up_switch_entity_id, STATE_ON)
+        await asyncio.sleep(TRAVEL_TIME / 2)
+        for cover in bench.covers:
+            bench.hass.states.async_set(cover._up_switch_entity_id, "off")
+
+    return await bench.async_run(action, 0.5)
+
+
+async def scenario_chatter(loop, count: int, latency: float) -> dict:
+    """Press the wall switches of `count` covers, five to a switch, with relay chatter."""
+    result = {}
+    for debounce in (0.0, 0.05):
+        bench = Bench(loop, latency)
+        await bench.async_setup(count, group=5, switch_debounce=debounce)
+        switches = sorted({cover._up_switch_entity_id for cover in bench.covers})
+
+        async def bounce(*states):
+            for state in states:
+                for entity_id in switches:
+                    bench.hass.states.async_set(entity_id, state)
+                await asyncio.sleep(0.01)
+
+        async def action():
+            await bounce(STATE_ON, "off", STATE_ON)
+            await asyncio.sleep(TRAVEL_TIME / 2)
+            await bounce("off", STATE_ON, "off")
+
+        run = await bench.async_run(action, 0.5)
+        router = bench.hass.data["blinds_controller"]["switch_router"]
+        prefix = f"debounce_{int(debounce * 1000)}ms"
+        result[f"{prefix}_routed"] = router.routed
+        result[f"{prefix}_external_handled"] = sum(cover._metrics.external_handled for cover in bench.covers)
+        result[f"{prefix}_service_calls"] = run["service_calls"]
+        result[f"{prefix}_loop_wakeups"] = run["loop_wakeups"]
+        result[f"{prefix}_positions"] = sorted({cover.current_cover_position for cover in bench.covers})
+    return result
+
+
+async def scenario_shared(loop, count: int, latency: float) -> dict:
+    """Open `count` covers wired in groups of five to shared relays."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count, group=5)
+
+    async def action():
+        await asyncio.gather(*(cover.async_open_cover() for cover in bench.covers))
+
+    result = await bench.async_run(action, TRAVEL_TIME + 0.5)
+    driver = bench.hass.data["blinds_controller"]["relay_driver"]
+    result["relay_calls_skipped"] = driver.skipped
+    return result
+
+
+async def scenario_faulty(loop, count: int, latency: float) -> dict:
+    """Open `count` covers while some relays hang and others fail once."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count, command_timeout=0.25, command_retries=1)
+    faults = bench.hass.services.faults
+    for index, cover in enumerate(bench.covers):
+        if index % 5 == 0:
+            faults[cover._up_switch_entity_id] = "hang"
+        elif index % 5 == 1:
+            faults[cover._up_switch_entity_id] = 1
+
+    async def action():
+        started = loop.time()
+        await asyncio.gather(
+            *(cover.async_open_cover() for cover in bench.covers), return_exceptions=True
+        )
+        result["command_wall_s"] = round(loop.time() - started, 3)
+
+    result = {}
+    result.update(await bench.async_run(action, TRAVEL_TIME + 0.5))
+    driver = bench.hass.data["blinds_controller"]["relay_driver"]
+    result["relay_retries"] = driver.retries
+    result["relay_failures"] = driver.failures
+    result["covers_failed"] = sum(cover._last_command_error is not None for cover in bench.covers)
+    result["final_positions"] = sorted({cover.current_cover_position for cover in bench.covers})
+    return result
+
+
+async def scenario_restart(loop, count: int, latency: float) -> dict:
+    """Restart hass while `count` covers travel, their relays staying on."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count)
+    for index, cover in enumerate(bench.covers):
+        await cover.async_set_known_position(100 if index % 2 == 0 else 0)
+    await asyncio.sleep(1.1)
+    storage_writes = bench.hass.storage_writes
+    await asyncio.gather(*(cover.async_close_cover() for cover in bench.covers[::2]))
+    await asyncio.sleep(0.1)
+    await asyncio.gather(*(cover.async_open_cover() for cover in bench.covers[1::2]))
+    # Let the pending delayed save run, as the final write on shutdown does.
+    await asyncio.sleep(1.1)
+    storage_writes = bench.hass.storage_writes - storage_writes
+    for cover in bench.covers:
+        cover.stop_auto_updater()
+
+    restarted = Bench(loop, latency)
+    restarted.hass.storage = bench.hass.storage
+    for entity_id in bench.hass.states.async_entity_ids("switch"):
+        restarted.hass.states.async_set(entity_id, bench.hass.states.get(entity_id).state)
+    started = time.perf_counter()
+    await restarted.async_setup(count, entry_ids=[cover.entry.entry_id for cover in bench.covers])
+    setup = time.perf_counter() - started
+    resumed = sum(cover._auto_updater_running for cover in restarted.covers)
+
+    async def action():
+        pass
+
+    result = await restarted.async_run(action, TRAVEL_TIME)
+    result["storage_writes_before_restart"] = storage_writes
+    result["setup_s"] = round(setup, 4)
+    result["resumed"] = resumed
+    result["final_positions"] = sorted({cover.current_cover_position for cover in restarted.covers})
+    return result
+
+
+class MotorPower:
+    """Power sensor of a physical blind: its motor draws power until it reaches an end limit."""
+
+    RUNNING = "60.0"
+
+    def __init__(self, hass, blind: PhysicalBlind, entity_id: str):
+        self._hass = hass
+        self._blind = blind
+        self.entity_id = entity_id
+        self._end_limit = None
+        hass.states.async_set(entity_id, "0.0")
+
+    def switch_changed(self, event) -> None:
+        """Follow the relays, after the blind did."""
+        if self._end_limit is not None:
+            self._end_limit.cancel()
+            self._end_limit = None
+        blind = self._blind
+        if blind.up == blind.down:
+            self._hass.states.async_set(self.entity_id, "0.0")
+            return
+        if blind.up:
+            remaining = (100.0 - blind.position) / 100 * blind.time_up
+        else:
+            remaining = blind.position / 100 * blind.time_down
+        self._hass.states.async_set(self.entity_id, self.RUNNING if remaining > 0 else "0.0")
+        if remaining > 0:
+            self._end_limit = self._hass.loop.call_later(
+                remaining, self._hass.states.async_set, self.entity_id, "0.0"
+            )
+
+
+async def scenario_power(loop, count: int, latency: float) -> dict:
+    """Learn the travel times of `count` covers, set too long and too short, from their power draw."""
+    result = {}
+    # Cost of an idle 1 Hz feed: readings below the threshold.
+    bench = Bench(loop, latency)
+    for index in range(count):
+        bench.hass.states.async_set(f"sensor.blind_{index}_power", "0.0")
+    await bench.async_setup(count, power_sensor=None)
+    for index, cover in enumerate(bench.covers):
+        bench.hass.config_entries.async_update_entry(
+            cover.entry, options={**cover.entry.data, "power_sensor": f"sensor.blind_{index}_power"}
+        )
+    await bench.hass.async_block_till_done()
+    samples = 20
+    started = time.process_time()
+    for second in range(samples):
+        for cover in bench.covers:
+            bench.hass.states.async_set(cover._power_sensor_entity_id, str(0.5 + second % 3 * 0.1))
+    result["us_per_power_sample"] = round((time.process_time() - started) * 1e6 / (samples * count), 2)
+
+    cycles = 8
+    for name, factor in (("too_long", 1.25), ("too_short", 0.8)):
+        bench = Bench(loop, latency)
+        await bench.async_setup(
+            count,
+            time_up=TRAVEL_TIME * factor,
+            time_down=TRAVEL_TIME * factor,
+            power_sensor="sensor.power",
+        )
+        blinds = []
+        for index, cover in enumerate(bench.covers):
+            blind = PhysicalBlind(loop, TRAVEL_TIME, TRAVEL_TIME, 0.0)
+            power = MotorPower(bench.hass, blind, f"sensor.blind_{index}_power")
+            bench.hass.states.async_track(
+                cover.switch_entity_ids, blind.switch_changed
+            )
+            bench.hass.states.async_track(
+                cover.switch_entity_ids, power.switch_changed
+            )
+            bench.hass.config_entries.async_update_entry(
+                cover.entry, options={**cover.entry.data, "power_sensor": power.entity_id}
+            )
+            await cover.async_set_known_position(0)
+            blinds.append(blind)
+        await bench.hass.async_block_till_done()
+
+        async def action():
+            for _ in range(cycles):
+                await asyncio.gather(*(cover.async_open_cover() for cover in bench.covers))
+                await asyncio.sleep(TRAVEL_TIME * 1.5)
+                await asyncio.gather(*(cover.async_close_cover() for cover in bench.covers))
+                await asyncio.sleep(TRAVEL_TIME * 1.5)
+            await asyncio.gather(*(cover.async_set_cover_position(position=50) for cover in bench.covers))
+
+        await bench.async_run(action, TRAVEL_TIME * 1.5)
+        prefix = f"{name}_{TRAVEL_TIME * factor:g}s"
+        result[f"{prefix}_learned_time_up"] = sorted({cover._travel_time_up for cover in bench.covers})
+        result[f"{prefix}_learned_time_down"] = sorted({cover._travel_time_down for cover in bench.covers})
+        # Where a move to 50 took the blinds, once learned.
+        result[f"{prefix}_physical_at_50"] = sorted({round(blind.position, 1) for blind in blinds})
+    return result
+
+
+async def scenario_metrics(loop, count: int, latency: float) -> dict:
+    """Open `count` covers with metric sensors, then collect their diagnostics."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count, metrics_sensors=True)
+    diagnostics = importlib.import_module(f"{INTEGRATION}.diagnostics")
+
+    async def action():
+        await asyncio.gather(*(cover.async_open_cover() for cover in bench.covers))
+
+    result = await bench.async_run(action, TRAVEL_TIME + 0.5)
+    started = time.perf_counter()
+    reports = [
+        await diagnostics.async_get_config_entry_diagnostics(bench.hass, cover.entry)
+        for cover in bench.covers
+    ]
+    result["diagnostics_ms_per_cover"] = round((time.perf_counter() - started) * 1000 / count, 3)
+    result["sensors"] = sum(entity_id.startswith("sensor.") for entity_id in bench.hass.entities)
+    result["ticks"] = sum(report["metrics"]["ticks"] for report in reports)
+    result["relay_commands"] = sum(report["metrics"]["relay_commands"] for report in reports)
+    result["motor_runtime_s_mean"] = round(
+        statistics.fmean(report["metrics"]["motor_runtime"] for report in reports), 3
+    )
+    return result
+
+
+async def scenario_options(loop, count: int, latency: float) -> dict:
+    """Change the travel times of `count` covers through their options while they open."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count)
+    hass = bench.hass
+    covers = list(bench.covers)
+
+    async def action():
+        await asyncio.gather(*(cover.async_open_cover() for cover in covers))
+        await asyncio.sleep(TRAVEL_TIME / 2)
+        for entry in hass.config_entries.async_entries():
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.data, "time_up": TRAVEL_TIME * 1.5}
+            )
+        await hass.async_block_till_done()
+
+    result = await bench.async_run(action, TRAVEL_TIME + 0.5)
+    bench.covers = [entity for entity in hass.entities.values() if entity.entity_id.startswith("cover.")]
+    result["covers"] = len(bench.covers)
+    result["covers_recreated"] = sum(cover not in covers for cover in bench.covers)
+    result["final_positions"] = sorted({cover.current_cover_position for cover in bench.covers})
+    return result
+
+
+async def scenario_recorder(loop, count: int, latency: float) -> dict:
+    """Open `count` covers in each recorder mode and count the states written."""
+    result = {}
+    for mode in ("all", "throttled", "endpoints"):
+        bench = Bench(loop, latency)
+        await bench.async_setup(count, recorder_mode=mode, recorder_interval=0.5)
+
+        async def action():
+            await asyncio.gather(*(cover.async_open_cover() for cover in bench.covers))
+
+        run = await bench.async_run(action, settle=TRAVEL_TIME + 0.5)
+        result[f"{mode}_state_writes_per_move"] = round(run["state_writes"] / count, 1)
+        result[f"{mode}_loop_wakeups"] = run["loop_wakeups"]
+        result[f"{mode}_final_positions"] = sorted({cover.current_cover_position for cover in bench.covers})
+    return result
+
+
+async def scenario_bulk(loop, count: int, latency: float) -> dict:
+    """Move `count` covers with one set_positions service call."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count)
+
+    async def action():
+        await bench.hass.services.async_call(
+            "blinds_controller",
+            "set_positions",
+            {"positions": {cover.entity_id: 50 for cover in bench.covers}, "max_concurrency": 16},
+            blocking=True,
+        )
+
+    return await bench.async_run(action, TRAVEL_TIME + 0.5)
+
+
+async def scenario_burst(loop, count: int, latency: float) -> dict:
+    """Send `count` covers a burst of position requests, like a dragged slider."""
+    bench = Bench(loop, latency)
+    await bench.async_setup(count)
+
+    async def action():
+        calls = []
+        for position in (30, 40, 50, 20, 60):
+            calls.extend(
+                bench.hass.async_create_task(cover.async_set_cover_position(position=position))
+                for cover in bench.covers
+            )
+            await asyncio.sleep(0.05)
+        await asyncio.gather(*calls)
+
+    result = await bench.async_run(action, TRAVEL_TIME + 0.5)
+    result["final_positions"] = sorted({cover.current_cover_position for cover in bench.covers})
+    return result
+
+
+async def scenario_setup(loop, count: int, latency: float) -> dict:
+    """Set up `count` config entries."""
+    bench = Bench(loop, latency)
+    started = time.perf_counter()
+    await bench.async_setup(count)
+    return {
+        "covers": len(bench.covers),
+        "setup_s": round(time.perf_counter() - started, 4),
+        "setup_ms_per_entry": round((time.perf_counter() - started) * 1000 / count, 4),
+        "entity_service_registrations": bench.hass.entity_service_registrations,
+    }
+
+
+SCENARIOS = {
+    "move": (scenario_move, (1, 50, 500)),
+    "long": (scenario_long, (1, 50)),
+    "tilt": (scenario_tilt, (1, 50)),
+    "plan": (scenario_plan, (1, 50)),
+    "admission": (scenario_admission, (10, 50)),
+    "arrival": (scenario_arrival, (10, 100)),
+    "backends": (scenario_backends, (10, 100)),
+    "external": (scenario_external, (1, 50)),
+    "shared": (scenario_shared, (10, 50)),
+    "chatter": (scenario_chatter, (10, 50)),
+    "faulty": (scenario_faulty, (10, 50)),
+    "restart": (scenario_restart, (10, 100)),
+    "power": (scenario_power, (10, 100)),
+    "faster_relay": (scenario_faster_relay, (10, 100)),
+    "metrics": (scenario_metrics, (10, 100)),
+    "options": (scenario_options, (1, 50)),
+    "recorder": (scenario_recorder, (1, 50)),
+    "bulk": (scenario_bulk, (50, 500)),
+    "burst": (scenario_burst, (1, 50)),
+    "setup": (scenario_setup, (10, 100, 200)),
+}
+
+# Scenarios whose travels take minutes, run on a virtual clock
+VIRTUAL_CLOCK = {"long", "power", "faster_relay"}
+
+
+def run(name: str, count: int, latency: float) -> dict:
+    """Run one scenario on a fresh event loop."""
+    func, _ = SCENARIOS[name]
+    if name in VIRTUAL_CLOCK:
+        loop = VirtualClockEventLoop()
+        restore_clock = loop.install_clock()
+    else:
+        loop, restore_clock = CountingEventLoop(), None
+    try:
+        result = loop.run_until_complete(func(loop, count, latency))
+    finally:
+        loop.close()
+        if restore_clock is not None:
+            restore_clock()
+    return {"scenario": name, "count": count, "latency_ms": latency * 1000, **result}
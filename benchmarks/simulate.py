@@ -0,0 +1,200 @@
+"""Discrete-event simulation of a fleet of covers on a virtual clock.
+
+The integration runs unchanged on the stand-in hass, on an event loop whose
+clock jumps straight to the next timer, so simulated days pass in seconds.
+Every blind has a physical model driven by its switch states, with its own
+true travel times and relay latency, against which the position the cover
+reports is checked.
+
+    python -m benchmarks.simulate --covers 1000 --days 1
+    python -m benchmarks.simulate --record events.jsonl --covers 10 --hours 2
+    python -m benchmarks.simulate --replay events.jsonl --covers 10
+
+The event log has one JSON object per line: `t` in seconds, `cover` index and
+`action`, one of set_position (with `position`), open, close, stop,
+switch_on and switch_off (with `switch`, up or down).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+
+from homeassistant.const import STATE_OFF, STATE_ON
+
+from .scenarios import TRAVEL_TIME, Bench, PhysicalBlind
+from .stub_hass import VirtualClockEventLoop
+
+
+def synthetic_events(covers: int, duration: float, interval: float, rng: random.Random):
+    """Yield a random event log, each cover acting every `interval` seconds on average."""
+    for cover in range(covers):
+        t = rng.expovariate(1 / interval)
+        while t < duration:
+            roll = rng.random()
+            if roll < 0.6:
+                yield {"t": t, "cover": cover, "action": "set_position", "position": rng.randint(0, 100)}
+            elif roll < 0.75:
+                yield {"t": t, "cover": cover, "action": "open"}
+            elif roll < 0.9:
+                yield {"t": t, "cover": cover, "action": "close"}
+            else:
+                # Someone presses a wall switch for a moment.
+                switch = rng.choice(("up", "down"))
+                yield {"t": t, "cover": cover, "action": "switch_on", "switch": switch}
+                yield {"t": t + rng.uniform(0.5, 3.0), "cover": cover, "action": "switch_off", "switch": switch}
+            t += rng.expovariate(1 / interval)
+
+
+class Simulation:
+    """Fleet of covers and their physical blinds on one virtual clock."""
+
+    def __init__(self, args, rng: random.Random):
+        self.args = args
+        self.rng = rng
+        self.loop = VirtualClockEventLoop()
+        self.bench = None
+        self.blinds = []
+        self.errors_by_hour = []
+
+    async def async_setup(self) -> None:
+        args, rng = self.args, self.rng
+        self.loop.install_clock()
+        self.bench = bench = Bench(self.loop, args.latency)
+        hass = bench.hass
+        jitter = args.jitter
+        base_call = hass.services.async_call
+
+        async def async_call_with_jitter(domain, service, data=None, **kwargs):
+            if domain == "switch" and jitter:
+                await asyncio.sleep(rng.uniform(0, jitter))
+            return await base_call(domain, service, data, **kwargs)
+
+        hass.services.async_call = async_call_with_jitter
+        await bench.async_setup(args.covers, update_mode=args.update_mode)
+
+        for cover in bench.covers:
+            error = args.travel_error
+            blind = PhysicalBlind(
+                self.loop,
+                TRAVEL_TIME * (1 + rng.uniform(-error, error)),
+                TRAVEL_TIME * (1 + rng.uniform(-error, error)),
+                50.0,
+            )
+            hass.states.async_track(
+                cover.switch_entity_ids, blind.switch_changed
+            )
+            await cover.async_set_known_position(50)
+            self.blinds.append(blind)
+
+    def _dispatch(self, event: dict) -> None:
+        cover = self.bench.covers[event["cover"]]
+        hass = self.bench.hass
+        action = event["action"]
+        if action == "set_position":
+            hass.async_create_task(cover.async_set_cover_position(position=event["position"]))
+        elif action == "open":
+            hass.async_create_task(cover.async_open_cover())
+        elif action == "close":
+            hass.async_create_task(cover.async_close_cover())
+        elif action == "stop":
+            hass.async_create_task(cover.async_stop_cover())
+        else:
+            entity_id = cover._up_switch_entity_id if event["switch"] == "up" else cover._down_switch_entity_id
+            hass.states.async_set(entity_id, STATE_ON if action == "switch_on" else STATE_OFF)
+
+    def errors(self) -> list[float]:
+        """Return the position error of every cover whose position is known."""
+        return [
+            abs(cover.current_cover_position - blind.position)
+            for cover, blind in zip(self.bench.covers, self.blinds)
+            if cover.current_cover_position is not None
+        ]
+
+    def _sample_errors(self) -> None:
+        self.errors_by_hour.append(round(statistics.fmean(self.errors() or [0.0]), 3))
+        self.loop.call_later(3600, self._sample_errors)
+
+    async def async_run(self, events: list[dict], duration: float) -> dict:
+        loop = self.loop
+        started = loop.time()
+        for event in events:
+            loop.call_at(started + event["t"], self._dispatch, event)
+        loop.call_later(3600, self._sample_errors)
+
+        hass = self.bench.hass
+        calls, wakeups, writes = hass.services.calls, loop.wakeups, hass.storage_writes
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        await asyncio.sleep(duration + TRAVEL_TIME * 2)
+        await hass.async_block_till_done()
+        wall = time.perf_counter() - wall_started
+
+        errors = self.errors()
+        driver = hass.data["blinds_controller"]["relay_driver"]
+        return {
+            "covers": len(self.bench.covers),
+            "events": len(events),
+            "simulated_s": round(duration, 1),
+            "wall_s": round(wall, 3),
+            "speedup": round(duration / wall, 1) if wall else None,
+            "cpu_s": round(time.process_time() - cpu_started, 3),
+            "loop_wakeups": loop.wakeups - wakeups,
+            "service_calls": hass.services.calls - calls,
+            "storage_writes": hass.storage_writes - writes,
+            "relay_commands_sent": driver.sent,
+            "relay_commands_skipped": driver.skipped,
+            "positions_unknown": sum(cover.current_cover_position is None for cover in self.bench.covers),
+            "error_mean": round(statistics.fmean(errors), 3) if errors else None,
+            "error_max": round(max(errors), 3) if errors else None,
+            "error_mean_by_hour": self.errors_by_hour,
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.simulate")
+    parser.add_argument("--covers", type=int, default=100)
+    parser.add_argument("--days", type=float, default=0.0)
+    parser.add_argument("--hours", type=float, default=0.0)
+    parser.add_argument("--interval", type=float, default=3600.0, help="mean seconds between actions of a cover")
+    parser.add_argument("--latency", type=float, default=0.05, help="switch service latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="random extra switch latency in seconds")
+    parser.add_argument("--travel-error", type=float, default=0.02, help="relative error of the configured travel times")
+    parser.add_argument("--update-mode", choices=("interval", "event"), default="interval")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--replay", type=argparse.FileType("r"), help="event log to replay")
+    parser.add_argument("--record", type=argparse.FileType("w"), help="write the generated event log")
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    duration = (args.days * 24 + args.hours) * 3600
+    if args.replay:
+        events = [json.loads(line) for line in args.replay if line.strip()]
+        duration = duration or max((event["t"] for event in events), default=0.0)
+    else:
+        duration = duration or 3600.0
+        events = sorted(
+            synthetic_events(args.covers, duration, args.interval, random.Random(args.seed)),
+            key=lambda event: event["t"],
+        )
+    if args.record:
+        for event in events:
+            args.record.write(json.dumps(event) + "\n")
+
+    # The model draws from its own stream, so a replay matches its recording.
+    simulation = Simulation(args, random.Random(args.seed))
+    loop = simulation.loop
+    try:
+        loop.run_until_complete(simulation.async_setup())
+        result = loop.run_until_complete(simulation.async_run(events, duration))
+    finally:
+        loop.close()
+    args.output.write(json.dumps({"simulation": "fleet", "seed": args.seed, **result}) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
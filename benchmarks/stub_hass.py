@@ -0,0 +1,468 @@
+"""Local stand-in for the parts of Home Assistant the integration talks to.
+
+Provides a state machine, a services registry whose switch services answer
+after a configurable latency, an MQTT broker with switches on it, config
+entries able to forward to the cover platform, and event loops that count
+their wakeups, on the real or on a virtual clock. Nothing here talks to a real Home Assistant instance or the
+network.
+"""
+import asyncio
+import heapq
+import importlib
+import itertools
+import json
+import time
+from types import MappingProxyType, SimpleNamespace
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import Event, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.restore_state import RestoreEntity
+
+INTEGRATION = "custom_components.blinds_controller"
+
+
+class CountingEventLoop(asyncio.SelectorEventLoop):
+    """Event loop counting how many times it woke up to run callbacks."""
+
+    def __init__(self):
+        super().__init__()
+        self.wakeups = 0
+
+    def _run_once(self):
+        self.wakeups += 1
+        super()._run_once()
+
+
+class VirtualClockEventLoop(CountingEventLoop):
+    """Event loop whose clock jumps to the next timer instead of sleeping."""
+
+    # Modules reading the monotonic clock of the integration
+    CLOCK_MODULES = ("calculator", "cover", "services", "store")
+
+    def __init__(self):
+        super().__init__()
+        self._now = 0.0
+
+    def time(self) -> float:
+        return self._now
+
+    def install_clock(self):
+        """Have the integration read this clock, return a callable restoring the real one."""
+        modules = [importlib.import_module(f"{INTEGRATION}.{name}") for name in self.CLOCK_MODULES]
+        clocks = [module.clock for module in modules]
+        for module in modules:
+            module.clock = self.time
+
+        def restore():
+            for module, clock in zip(modules, clocks):
+                module.clock = clock
+
+        return restore
+
+    def _run_once(self):
+        scheduled = self._scheduled
+        # Jump past cancelled timers, or the loop would really wait for the
+        # next live one.
+        while scheduled and scheduled[0]._cancelled:
+            self._timer_cancelled_count -= 1
+            heapq.heappop(scheduled)._scheduled = False
+        if not self._ready and scheduled:
+            self._now = max(self._now, scheduled[0]._when)
+        super()._run_once()
+
+
+class StubStates:
+    """State machine notifying subscribers of state changes."""
+
+    def __init__(self, hass: "StubHass"):
+        self._hass = hass
+        self._states = {}
+        self._listeners = {}
+
+    def get(self, entity_id: str) -> State | None:
+        return self._states.get(entity_id)
+
+    def async_entity_ids(self, domain: str | None = None) -> list[str]:
+        return [
+            entity_id
+            for entity_id in self._states
+            if domain is None or entity_id.startswith(f"{domain}.")
+        ]
+
+    def async_set(self, entity_id: str, state: str, attributes: dict | None = None) -> None:
+        old_state = self._states.get(entity_id)
+        new_state = State(entity_id, state, attributes or {})
+        self._states[entity_id] = new_state
+        if old_state is not None and old_state.state == state and entity_id.startswith("switch."):
+            return
+        event = Event(
+            "state_changed",
+            {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+        )
+        for listener in list(self._listeners.get(entity_id, ())):
+            result = listener(event)
+            if asyncio.iscoroutine(result):
+                self._hass.async_create_task(result)
+
+    def async_track(self, entity_ids, action):
+        """Stand-in for async_track_state_change_event."""
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        for entity_id in entity_ids:
+            self._listeners.setdefault(entity_id, []).append(action)
+
+        def unsubscribe():
+            for entity_id in entity_ids:
+                self._listeners[entity_id].remove(action)
+
+        return unsubscribe
+
+
+class StubBroker:
+    """In-process MQTT broker, standing in for `homeassistant.components.mqtt`.
+
+    A publish returns after `latency`, when the broker acknowledges it, and
+    then reaches the subscribers of its topic. A switch added to the broker is
+    an MQTT switch entity following its state topic, wired to a relay that
+    reports every command on that topic.
+    """
+
+    def __init__(self, hass: "StubHass", latency: float = 0.0):
+        self._hass = hass
+        self.latency = latency
+        self.published = 0
+        self.switches = {}
+        self._subscribers = {}
+
+    async def async_wait_for_mqtt_client(self, hass) -> bool:
+        return True
+
+    async def async_publish(self, hass, topic, payload, qos=0, retain=False, encoding="utf-8") -> None:
+        self.published += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._deliver(topic, payload)
+
+    async def async_subscribe(self, hass, topic, msg_callback, qos=0, encoding="utf-8"):
+        self._subscribers.setdefault(topic, []).append(msg_callback)
+        return lambda: self._subscribers[topic].remove(msg_callback)
+
+    def _deliver(self, topic: str, payload: str) -> None:
+        message = SimpleNamespace(topic=topic, payload=payload)
+        for msg_callback in list(self._subscribers.get(topic, ())):
+            msg_callback(message)
+
+    def add_switch(self, entity_id: str) -> dict:
+        """Put a switch on the broker and return its relay configuration."""
+        relay = self.switches[entity_id] = {
+            "command_topic": f"{entity_id}/set",
+            "state_topic": f"{entity_id}/state",
+            "payload_on": "ON",
+            "payload_off": "OFF",
+            "state_on": "ON",
+            "state_off": "OFF",
+            "qos": 1,
+            "retain": False,
+        }
+        self._subscribers.setdefault(relay["command_topic"], []).append(
+            lambda message: self._deliver(relay["state_topic"], message.payload)
+        )
+        self._subscribers.setdefault(relay["state_topic"], []).append(
+            lambda message: self._hass.states.async_set(entity_id, STATE_ON if message.payload == "ON" else STATE_OFF)
+        )
+        return relay
+
+
+# What the switch services validate their calls with
+_SWITCH_SERVICE_SCHEMA = cv.make_entity_service_schema({})
+
+
+class StubServices:
+    """Services registry, switch services complete after `latency` seconds.
+
+    `faults` maps a switch to "hang", never answering, or to a number of calls
+    that fail before it works again.
+    """
+
+    def __init__(self, hass: "StubHass", latency: float = 0.0):
+        self._hass = hass
+        self.latency = latency
+        self.faults = {}
+        self.calls = 0
+        self.round_trips = []
+        self._services = {}
+
+    def has_service(self, domain: str, service: str) -> bool:
+        return (domain, service) in self._services
+
+    def async_register(self, domain, service, handler, schema=None, supports_response=None):
+        self._services[(domain, service)] = SimpleNamespace(
+            handler=handler, schema=schema, supports_response=supports_response
+        )
+
+    def async_remove(self, domain, service):
+        self._services.pop((domain, service), None)
+
+    async def async_call(self, domain, service, data=None, blocking=False, return_response=False, **kwargs):
+        data = data or {}
+        self.calls += 1
+        started = time.perf_counter()
+        if domain == "switch":
+            entity_ids = data["entity_id"]
+            if isinstance(entity_ids, str):
+                entity_ids = [entity_ids]
+            broker = self._hass.broker
+            if all(entity_id in broker.switches for entity_id in entity_ids):
+                # MQTT switches publish their command, like the real entities.
+                _SWITCH_SERVICE_SCHEMA(data)
+                for entity_id in entity_ids:
+                    relay = broker.switches[entity_id]
+                    payload = relay["payload_on"] if service == "turn_on" else relay["payload_off"]
+                    await broker.async_publish(self._hass, relay["command_topic"], payload, relay["qos"])
+                self.round_trips.append(time.perf_counter() - started)
+                return None
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            for entity_id in entity_ids:
+                fault = self.faults.get(entity_id)
+                if fault == "hang":
+                    await asyncio.Event().wait()
+                elif fault:
+                    self.faults[entity_id] -= 1
+                    raise HomeAssistantError(f"{entity_id} did not respond")
+            for entity_id in entity_ids:
+                self._hass.states.async_set(entity_id, STATE_ON if service == "turn_on" else STATE_OFF)
+        else:
+            registered = self._services[(domain, service)]
+            if registered.schema is not None:
+                data = registered.schema(data)
+            call = SimpleNamespace(domain=domain, service=service, data=data, return_response=return_response, hass=self._hass)
+            result = registered.handler(call)
+            if asyncio.iscoroutine(result):
+                result = await result
+            return result
+        # Only relay commands count towards the command latency.
+        self.round_trips.append(time.perf_counter() - started)
+        return None
+
+
+class StubStore:
+    """Store keeping its data as JSON in `hass.storage`, counting the writes."""
+
+    def __init__(self, hass: "StubHass", version: int, key: str, **kwargs):
+        self._hass = hass
+        self.key = key
+        self._handle = None
+
+    async def async_load(self):
+        data = self._hass.storage.get(self.key)
+        return None if data is None else json.loads(data)
+
+    async def async_save(self, data) -> None:
+        self._hass.storage[self.key] = json.dumps(data)
+        self._hass.storage_writes += 1
+
+    def async_delay_save(self, data_func, delay: float = 0) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self._hass.loop.call_later(delay, self._write, data_func)
+
+    def _write(self, data_func) -> None:
+        self._handle = None
+        self._hass.storage[self.key] = json.dumps(data_func())
+        self._hass.storage_writes += 1
+
+
+class StubConfigEntry:
+    """Config entry holding data and options of one blind."""
+
+    _ids = itertools.count()
+
+    def __init__(self, data: dict, options: dict | None = None, entry_id: str | None = None):
+        self.entry_id = entry_id or f"entry_{next(self._ids)}"
+        self.domain = "blinds_controller"
+        self.title = data.get("ent_name", self.entry_id)
+        self.data = MappingProxyType(dict(data))
+        self.options = MappingProxyType(dict(options or {}))
+        self.update_listeners = []
+        self._on_unload = []
+
+    def add_update_listener(self, listener):
+        self.update_listeners.append(listener)
+        return lambda: self.update_listeners.remove(listener)
+
+    def async_on_unload(self, func) -> None:
+        self._on_unload.append(func)
+
+    def run_unload_callbacks(self) -> None:
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+class StubPlatform:
+    """Entity platform of one config entry."""
+
+    def __init__(self, hass: "StubHass", entry: StubConfigEntry):
+        self.hass = hass
+        self.entry = entry
+        self.entities = []
+
+    def async_register_entity_service(self, name, schema, func, *args, **kwargs):
+        self.hass.entity_service_registrations += 1
+
+
+class StubConfigEntries:
+    """Config entries manager forwarding entries to the integration platforms."""
+
+    def __init__(self, hass: "StubHass"):
+        self._hass = hass
+        self._entries = {}
+        self._platforms = {}
+
+    def async_entries(self, domain: str | None = None) -> list[StubConfigEntry]:
+        return list(self._entries.values())
+
+    def async_get_entry(self, entry_id: str) -> StubConfigEntry | None:
+        return self._entries.get(entry_id)
+
+    async def async_add(self, entry: StubConfigEntry) -> bool:
+        self._entries[entry.entry_id] = entry
+        return await self._hass.integration.async_setup_entry(self._hass, entry)
+
+    async def async_remove(self, entry_id: str) -> None:
+        entry = self._entries[entry_id]
+        await self._hass.integration.async_unload_entry(self._hass, entry)
+        del self._entries[entry_id]
+
+    async def async_reload(self, entry_id: str) -> None:
+        entry = self._entries[entry_id]
+        await self._hass.integration.async_unload_entry(self._hass, entry)
+        entry.run_unload_callbacks()
+        await self._hass.integration.async_setup_entry(self._hass, entry)
+
+    def async_update_entry(self, entry: StubConfigEntry, *, data=None, options=None, title=None) -> bool:
+        if data is not None:
+            entry.data = MappingProxyType(dict(data))
+        if options is not None:
+            entry.options = MappingProxyType(dict(options))
+        for listener in list(entry.update_listeners):
+            self._hass.async_create_task(listener(self._hass, entry))
+        return True
+
+    async def async_forward_entry_setups(self, entry: StubConfigEntry, platforms) -> None:
+        for platform_name in platforms:
+            await self.async_forward_entry_setup(entry, platform_name)
+
+    async def async_forward_entry_setup(self, entry: StubConfigEntry, platform_name: str) -> bool:
+        module = importlib.import_module(f"{INTEGRATION}.{platform_name}")
+        platform = StubPlatform(self._hass, entry)
+        self._platforms[(entry.entry_id, platform_name)] = platform
+        self._hass.current_platform = platform
+
+        adding = []
+
+        def async_add_entities(entities, update_before_add=False):
+            for entity in entities:
+                adding.append(self._hass.async_create_task(self._hass.async_add_entity(platform, entity)))
+
+        await module.async_setup_entry(self._hass, entry, async_add_entities)
+        self._hass.current_platform = None
+        if adding:
+            await asyncio.gather(*adding)
+        return True
+
+    async def async_forward_entry_unload(self, entry: StubConfigEntry, platform_name: str) -> bool:
+        platform = self._platforms.pop((entry.entry_id, platform_name), None)
+        if platform is not None:
+            for entity in platform.entities:
+                await entity.async_will_remove_from_hass()
+                self._hass.entities.pop(entity.entity_id, None)
+        return True
+
+    async def async_unload_platforms(self, entry: StubConfigEntry, platforms) -> bool:
+        for platform_name in platforms:
+            await self.async_forward_entry_unload(entry, platform_name)
+        return True
+
+
+class StubHass:
+    """Minimal `hass` object the integration can run against."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, latency: float = 0.0):
+        self.loop = loop
+        self.data = {}
+        self.states = StubStates(self)
+        self.services = StubServices(self, latency)
+        self.broker = StubBroker(self, latency)
+        self.config_entries = StubConfigEntries(self)
+        self.config = SimpleNamespace(config_dir=None)
+        self.integration = importlib.import_module(INTEGRATION)
+        self.entities = {}
+        self.current_platform = None
+        self.state_writes = 0
+        self.storage = {}
+        self.storage_writes = 0
+        self.entity_service_registrations = 0
+        self._tasks = set()
+
+    def async_create_task(self, target, name=None, eager_start=False):
+        task = self.loop.create_task(target)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def async_create_background_task(self, target, name=None, eager_start=False):
+        return self.async_create_task(target, name)
+
+    def async_add_job(self, target, *args):
+        if asyncio.iscoroutine(target):
+            return self.async_create_task(target)
+        return self.loop.call_soon(target, *args)
+
+    def async_run_hass_job(self, job, *args):
+        result = job.target(*args)
+        if asyncio.iscoroutine(result):
+            return self.async_create_task(result)
+        return None
+
+    async def async_block_till_done(self) -> None:
+        current = asyncio.current_task()
+        while pending := [task for task in self._tasks if task is not current]:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def async_add_entity(self, platform: StubPlatform, entity: Entity) -> None:
+        domain = type(entity).__module__.rsplit(".", 1)[-1]
+        entity.hass = self
+        entity.entity_id = f"{domain}.{entity.unique_id}"
+        platform.entities.append(entity)
+        self.entities[entity.entity_id] = entity
+        await entity.async_added_to_hass()
+        entity.async_write_ha_state()
+
+
+def _stub_write_ha_state(self: Entity) -> None:
+    """Compute the state and attributes like Home Assistant does, and store them."""
+    attributes = dict(self.state_attributes or {})
+    attributes.update(self.extra_state_attributes or {})
+    self.hass.state_writes += 1
+    self.hass.states.async_set(self.entity_id, self.state, attributes)
+
+
+async def _stub_get_last_state(self: RestoreEntity) -> State | None:
+    return self.hass.states.get(self.entity_id)
+
+
+def install(hass: StubHass) -> None:
+    """Point the Home Assistant helpers used by the integration at the stand-in."""
+    Entity.async_write_ha_state = _stub_write_ha_state
+    Entity.async_schedule_update_ha_state = lambda self, force_refresh=False: _stub_write_ha_state(self)
+    RestoreEntity.async_get_last_state = _stub_get_last_state
+
+    track = lambda _hass, entity_ids, action: hass.states.async_track(entity_ids, action)
+    for module in ("cover", "router"):
+        importlib.import_module(f"{INTEGRATION}.{module}").async_track_state_change_event = track
+    importlib.import_module(f"{INTEGRATION}.store").Store = StubStore
+    importlib.import_module(f"{INTEGRATION}.mqtt_relay").mqtt = hass.broker
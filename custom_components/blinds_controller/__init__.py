@@ -1,13 +1,89 @@
 # Import necessary modules from Home Assistant
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 
 # Import the domain constant from the current package
-from .const import DOMAIN
-from . import cover  # Import the cover platform
+from .admission import async_get_admission
+from .const import (
+    CONF_CIRCUITS,
+    CONF_COMMAND_TOPIC,
+    CONF_MAX_RUNNING_MOTORS,
+    CONF_MQTT_RELAYS,
+    CONF_PAYLOAD_OFF,
+    CONF_PAYLOAD_ON,
+    CONF_QOS,
+    CONF_RETAIN,
+    CONF_STATE_OFF,
+    CONF_STATE_ON,
+    CONF_STATE_TOPIC,
+    DATA_METRICS,
+    DOMAIN,
+)
+from .relay import async_get_relay_driver
+from .services import async_setup_services
+from .store import async_get_motion_store
+
+# The sensor platform only adds entities when the metrics_sensors option is set.
+PLATFORMS = ["cover", "sensor"]
+
+_MOTOR_LIMIT = vol.All(vol.Coerce(int), vol.Range(min=1))
+
+
+def _default_states(relay: dict) -> dict:
+    """Expect the command payloads on the state topic, unless told otherwise."""
+    return {CONF_STATE_ON: relay[CONF_PAYLOAD_ON], CONF_STATE_OFF: relay[CONF_PAYLOAD_OFF], **relay}
+
+
+_MQTT_RELAY_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CONF_COMMAND_TOPIC): cv.string,
+            vol.Optional(CONF_STATE_TOPIC): cv.string,
+            vol.Optional(CONF_PAYLOAD_ON, default="ON"): cv.string,
+            vol.Optional(CONF_PAYLOAD_OFF, default="OFF"): cv.string,
+            vol.Optional(CONF_STATE_ON): cv.string,
+            vol.Optional(CONF_STATE_OFF): cv.string,
+            vol.Optional(CONF_QOS, default=0): vol.All(vol.Coerce(int), vol.In([0, 1, 2])),
+            vol.Optional(CONF_RETAIN, default=False): cv.boolean,
+        }
+    ),
+    _default_states,
+)
+
+# Covers are set up from config entries, the YAML configuration only holds
+# the limits shared by all of them.
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_MAX_RUNNING_MOTORS): _MOTOR_LIMIT,
+                vol.Optional(CONF_CIRCUITS, default={}): {cv.string: _MOTOR_LIMIT},
+                vol.Optional(CONF_MQTT_RELAYS, default={}): {cv.entity_id: _MQTT_RELAY_SCHEMA},
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the blinds controller component."""
+    domain_config = config.get(DOMAIN, {})
+    async_get_admission(hass).configure(
+        domain_config.get(CONF_MAX_RUNNING_MOTORS), domain_config.get(CONF_CIRCUITS, {})
+    )
+    if mqtt_relays := domain_config.get(CONF_MQTT_RELAYS):
+        # Importing MQTT takes a while, so only installs using it pay for it.
+        from .mqtt_relay import MqttRelayBackend
+
+        backend = MqttRelayBackend(hass, mqtt_relays)
+        async_get_relay_driver(hass).async_set_backend(backend, backend.entity_ids)
+        # MQTT may come up after the integration, the states follow once it does.
+        hass.async_create_background_task(backend.async_start(), f"{DOMAIN} mqtt relay states")
+    await async_setup_services(hass)
+    # One bulk load of the travel state of all covers, before any is added.
+    await async_get_motion_store(hass).async_load()
     # Return True to enable the config flow.
     return True
 
@@ -18,17 +94,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     
     # Corrected function call: async_forward_entry_setups (plural)
     # This forwards the setup to the 'cover' platform.
-    await hass.config_entries.async_forward_entry_setups(entry, ["cover"])
-    
-    # Add an update listener to reload the integration when options change
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
-    
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Option changes are applied in place by the cover, see
+    # BlindsCover.async_options_updated.
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload your integration when the configuration entry is removed."""
     # Forward the unload to the 'cover' platform
-    unload_ok = await hass.config_entries.async_forward_entry_unload(entry, "cover")
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     # If unload was successful, remove the entry data
     if unload_ok:
@@ -36,7 +111,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
         
     return unload_ok
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
-    """Reload the config entry when options are updated."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Forget the stored travel state and the metrics of a removed cover."""
+    hass.data.get(DOMAIN, {}).get(DATA_METRICS, {}).pop(entry.entry_id, None)
+    await async_get_motion_store(hass).async_remove(entry.entry_id)
@@ -0,0 +1,165 @@
+import asyncio
+import heapq
+import itertools
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_ADMISSION, DOMAIN
+from .metrics import Histogram
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MotorAdmission:
+    """Limit how many motors run at once, globally and per circuit.
+
+    A cover is admitted before its motor starts and holds its slot until the
+    motor stops. Covers over a limit wait in a queue served by priority, then
+    arrival; a cover blocked only by its own circuit does not hold back
+    covers on other circuits.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_running: int | None = None, circuits: dict | None = None):
+        """Initialize the controller, without limits by default."""
+        self.hass = hass
+        self.max_running = max_running
+        self.circuits = dict(circuits or {})
+        self._running = {}
+        self._circuit_running = {}
+        self._queue = []
+        self._sequence = itertools.count()
+        self.admitted = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.wait = Histogram()
+
+    @property
+    def running(self) -> int:
+        """Return the number of motors admitted and not released."""
+        return len(self._running)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of covers waiting for their motor to be admitted."""
+        return sum(not waiter.done() for _, _, _, _, waiter in self._queue)
+
+    @callback
+    def configure(self, max_running: int | None, circuits: dict) -> None:
+        """Change the limits, admitting the covers they now allow."""
+        self.max_running = max_running
+        self.circuits = dict(circuits)
+        self._async_admit_queued()
+
+    @callback
+    def is_admitted(self, owner) -> bool:
+        """Return if the motor of `owner` holds a slot."""
+        return owner in self._running
+
+    def _fits(self, circuit: str | None) -> bool:
+        if self.max_running is not None and len(self._running) >= self.max_running:
+            return False
+        limit = self.circuits.get(circuit)
+        return limit is None or self._circuit_running.get(circuit, 0) < limit
+
+    @callback
+    def _admit(self, owner, circuit: str | None) -> None:
+        self._running[owner] = circuit
+        self._circuit_running[circuit] = self._circuit_running.get(circuit, 0) + 1
+        self.admitted += 1
+
+    @callback
+    def try_acquire(self, owner, circuit: str | None = None) -> bool:
+        """Admit the motor of `owner` if it may start at once."""
+        if owner in self._running:
+            return True
+        # The queue only holds motors that do not fit, those blocked by their
+        # circuit alone must not hold back the other circuits.
+        if not self._fits(circuit):
+            return False
+        self._admit(owner, circuit)
+        self.wait.add(0.0)
+        return True
+
+    @callback
+    def claim(self, owner, circuit: str | None = None) -> None:
+        """Count a motor started outside the admission, e.g. by a wall switch, even over a limit."""
+        if owner not in self._running:
+            self._admit(owner, circuit)
+
+    async def async_acquire(self, owner, circuit: str | None = None, priority: int = 0) -> float:
+        """Wait until the motor of `owner` may start. Return the seconds waited."""
+        if self.try_acquire(owner, circuit):
+            return 0.0
+
+        loop = self.hass.loop
+        started = loop.time()
+        waiter = loop.create_future()
+        heapq.heappush(self._queue, (-priority, next(self._sequence), owner, circuit, waiter))
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        _LOGGER.debug("Motor of %s queued, %d running", owner, len(self._running))
+        # Covers ahead of it may be blocked only by their own circuit.
+        self._async_admit_queued()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as the command was superseded.
+                self.release(owner)
+            raise
+        waited = loop.time() - started
+        self.wait.add(waited)
+        return waited
+
+    @callback
+    def release(self, owner) -> None:
+        """Give the slot of a stopped motor to the next covers in the queue."""
+        if owner not in self._running:
+            return
+        circuit = self._running.pop(owner)
+        self._circuit_running[circuit] -= 1
+        self._async_admit_queued()
+
+    @callback
+    def _async_admit_queued(self) -> None:
+        """Admit the queued covers that fit, in priority order."""
+        blocked = []
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            _, _, owner, circuit, waiter = entry
+            if waiter.done():
+                continue
+            if self.max_running is not None and len(self._running) >= self.max_running:
+                blocked.append(entry)
+                break
+            if not self._fits(circuit):
+                blocked.append(entry)
+                continue
+            self._admit(owner, circuit)
+            waiter.set_result(None)
+        for entry in blocked:
+            heapq.heappush(self._queue, entry)
+
+    def as_dict(self) -> dict:
+        """Return the state of the controller for diagnostics."""
+        return {
+            "max_running": self.max_running,
+            "circuits": self.circuits,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "wait": self.wait.as_dict(),
+        }
+
+
+@callback
+def async_get_admission(hass: HomeAssistant) -> MotorAdmission:
+    """Return the motor admission controller shared by all covers of the domain."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    admission = domain_data.get(DATA_ADMISSION)
+    if admission is None:
+        admission = domain_data[DATA_ADMISSION] = MotorAdmission(hass)
+    return admission
@@ -0,0 +1,30 @@
+import logging
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SwitchServiceBackend:
+    """Switch relays through the switch services of Home Assistant."""
+
+    name = "switch"
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the backend."""
+        self.hass = hass
+
+    @callback
+    def state(self, entity_id: str) -> bool | None:
+        """Return if the relay is on, None when unknown."""
+        state = self.hass.states.get(entity_id)
+        if state is None or state.state not in (STATE_ON, STATE_OFF):
+            return None
+        return state.state == STATE_ON
+
+    async def async_set(self, entity_id: str, on: bool) -> None:
+        """Switch the relay, returning once the switch entity handled the call."""
+        await self.hass.services.async_call(
+            "switch", "turn_on" if on else "turn_off", {"entity_id": entity_id}, blocking=True
+        )
@@ -1,6 +1,12 @@
 import time
+from array import array
+from bisect import bisect_right
 from enum import Enum
 
+# Monotonic clock for all travel computations, NTP steps of the wall clock
+# must not move a cover.
+clock = time.monotonic
+
 
 class PositionType(Enum):
     """Enum class for different type of calculated positions."""
@@ -16,12 +22,81 @@ class TravelStatus(Enum):
     STOPPED = 3
 
 
+class TravelCurve:
+    """Piecewise linear table of the share of the full travel time against position.
+
+    Compiled once into two ascending arrays, both lookups are a bisection
+    followed by a linear interpolation.
+    """
+
+    __slots__ = ("positions", "times")
+
+    def __init__(self, points, full_time: float):
+        """Compile `(position, seconds from fully closed)` points.
+
+        `full_time` is used for the fully open end unless a point gives it.
+        """
+        table = {0: 0.0, 100: float(full_time)}
+        table.update((int(position), float(seconds)) for position, seconds in points)
+        positions = sorted(table)
+        times = [table[position] for position in positions]
+        if positions[0] < 0 or positions[-1] > 100:
+            raise ValueError("calibration positions must be within 0-100")
+        if any(later <= earlier for earlier, later in zip(times, times[1:])):
+            raise ValueError("calibration times must increase with the position")
+        self.positions = array("d", positions)
+        self.times = array("d", (seconds / times[-1] for seconds in times))
+
+    def time_at(self, position: float) -> float:
+        """Return the share of the full travel time needed to reach `position` from closed."""
+        positions = self.positions
+        index = min(max(bisect_right(positions, position), 1), len(positions) - 1)
+        p0, p1 = positions[index - 1], positions[index]
+        t0, t1 = self.times[index - 1], self.times[index]
+        return t0 + (t1 - t0) * (position - p0) / (p1 - p0)
+
+    def position_at(self, share: float) -> float:
+        """Return the position reached from closed after `share` of the full travel time."""
+        times = self.times
+        index = min(max(bisect_right(times, share), 1), len(times) - 1)
+        t0, t1 = times[index - 1], times[index]
+        p0, p1 = self.positions[index - 1], self.positions[index]
+        return p0 + (p1 - p0) * (share - t0) / (t1 - t0)
+
+
 class TravelCalculator:
     """Class for calculating the current position of a cover."""
 
-    # --- THIS IS THE FIX ---
-    # The __init__ function now correctly accepts the startup_delay argument.
-    def __init__(self, travel_time_down: float, travel_time_up: float, startup_delay: float = 0.0):
+    __slots__ = (
+        "position_type",
+        "last_known_position",
+        "travel_time_down",
+        "travel_time_up",
+        "startup_delay",
+        "travel_to_position",
+        "travel_started_time",
+        "travel_direction",
+        "position_closed",
+        "position_open",
+        "time_set_from_outside",
+        "pinned_time",
+        "curve",
+        "_curve_from",
+        "_curve_span",
+        "_relative_position",
+        "_travel_time",
+        "_movement_start",
+        "_memo_time",
+        "_memo_position",
+    )
+
+    def __init__(
+        self,
+        travel_time_down: float,
+        travel_time_up: float,
+        startup_delay: float = 0.0,
+        curve: TravelCurve | None = None,
+    ):
         """Initialize TravelCalculator class."""
         self.position_type = PositionType.UNKNOWN
         self.last_known_position = 0
@@ -37,25 +112,52 @@ class TravelCalculator:
         self.position_closed = 0
         self.position_open = 100
 
+        # Test hook, takes precedence over every other clock source.
         self.time_set_from_outside = None
+        # Instant every read is evaluated at while a state is being written.
+        self.pinned_time = None
+
+        self.curve = curve
+        self._prepare_move()
 
     def set_position(self, position: int):
         """Set known position of cover."""
         self.last_known_position = position
         self.travel_to_position = position
         self.position_type = PositionType.CONFIRMED
+        self._prepare_move()
 
-    def stop(self):
-        """Stop traveling."""
-        self.last_known_position = self.current_position()
+    def stop(self, now: float | None = None):
+        """Stop traveling, at `now` if given."""
+        self.last_known_position = self.current_position() if now is None else self._calculate_position(now)
         self.travel_to_position = self.last_known_position
         self.position_type = PositionType.CALCULATED
         self.travel_direction = TravelStatus.STOPPED
+        self._prepare_move()
+
+    def set_travel_times(
+        self,
+        travel_time_down: float,
+        travel_time_up: float,
+        startup_delay: float,
+        curve: TravelCurve | None = None,
+    ):
+        """Change the travel times, keeping the current position and any travel in progress."""
+        if self.travel_direction is not TravelStatus.STOPPED:
+            now = self.current_time()
+            # Continue from here, the motor keeps whatever startup it has left.
+            self.last_known_position = self.current_position()
+            self.travel_started_time = max(self._movement_start, now) - startup_delay
+        self.travel_time_down = travel_time_down
+        self.travel_time_up = travel_time_up
+        self.startup_delay = startup_delay
+        self.curve = curve
+        self._prepare_move()
 
-    def start_travel(self, travel_to_position: int):
-        """Start traveling to position."""
+    def start_travel(self, travel_to_position: int, now: float | None = None):
+        """Start traveling to position, at `now` if given."""
         self.stop()
-        self.travel_started_time = self.current_time()
+        self.travel_started_time = self.current_time() if now is None else now
         self.travel_to_position = travel_to_position
         self.position_type = PositionType.CALCULATED
 
@@ -64,6 +166,26 @@ class TravelCalculator:
             if travel_to_position > self.last_known_position
             else TravelStatus.DIRECTION_DOWN
         )
+        self._prepare_move()
+
+    def retarget(self, travel_to_position: int, now: float | None = None):
+        """Change the target of the travel in progress, at `now` if given.
+
+        The motor keeps running in its direction, so it keeps whatever startup
+        it has left instead of starting again.
+        """
+        if now is None:
+            now = self.current_time()
+        self.last_known_position = self._calculate_position(now)
+        self.travel_started_time = max(self._movement_start, now) - self.startup_delay
+        self.travel_to_position = travel_to_position
+        self._prepare_move()
+
+    def confirm_travel(self, now: float):
+        """Move the start of the current travel to `now`, when the motor was confirmed running."""
+        if self.travel_direction is not TravelStatus.STOPPED and now > self.travel_started_time:
+            self.travel_started_time = now
+            self._prepare_move()
 
     def start_travel_up(self):
         """Start traveling up."""
@@ -75,9 +197,19 @@ class TravelCalculator:
 
     def current_position(self) -> int:
         """Return current (calculated or known) position."""
-        if self.position_type == PositionType.CALCULATED:
-            return self._calculate_position()
-        return self.last_known_position
+        if self.position_type is not PositionType.CALCULATED:
+            return self.last_known_position
+
+        # Only a pinned clock can repeat, a live one is never worth memoizing.
+        now = self.time_set_from_outside
+        if now is None:
+            now = self.pinned_time
+            if now is None:
+                return self._calculate_position(clock())
+        if now != self._memo_time:
+            self._memo_position = self._calculate_position(now)
+            self._memo_time = now
+        return self._memo_position
 
     def is_traveling(self) -> bool:
         """Return if cover is traveling."""
@@ -95,58 +227,120 @@ class TravelCalculator:
         """Return if cover is (fully) closed."""
         return self.current_position() == self.position_closed
 
-    def _calculate_position(self) -> int:
+    def _calculate_position(self, now: float) -> int:
         """Return calculated position."""
-        if self.travel_direction == TravelStatus.STOPPED:
+        if self.travel_direction is TravelStatus.STOPPED:
             return self.last_known_position
 
-        elapsed_time = self.current_time() - self.travel_started_time
-        if elapsed_time < self.startup_delay:
+        elapsed_time = now - self._movement_start
+        if elapsed_time < 0:
             return self.last_known_position
-        
-        effective_elapsed_time = elapsed_time - self.startup_delay
-
-        relative_position = self.travel_to_position - self.last_known_position
-        travel_time = self._calculate_travel_time(relative_position)
-
-        if travel_time == 0:
-            return self.travel_to_position
 
-        if effective_elapsed_time >= travel_time:
+        travel_time = self._travel_time
+        if travel_time == 0 or elapsed_time >= travel_time:
             return self.travel_to_position
 
-        progress = effective_elapsed_time / travel_time
-        position = self.last_known_position + relative_position * progress
+        if self.curve is not None:
+            position = self.curve.position_at(self._curve_from + self._curve_span * (elapsed_time / travel_time))
+        else:
+            position = self.last_known_position + self._relative_position * (elapsed_time / travel_time)
         return int(round(position))
 
+    def trajectory(self) -> tuple[int, int, float, float, float] | None:
+        """Return start position, target, start time, startup delay and duration of the travel."""
+        if self.travel_direction is TravelStatus.STOPPED:
+            return None
+        return (
+            self.last_known_position,
+            self.travel_to_position,
+            self.travel_started_time,
+            self.startup_delay,
+            self._travel_time,
+        )
+
+    def time_to_target(self) -> float | None:
+        """Return seconds until the cover reaches `travel_to_position`."""
+        if self.travel_direction is TravelStatus.STOPPED:
+            return None
+        arrival = self._movement_start + self._travel_time
+        return max(arrival - self.current_time(), 0.0)
+
+    def time_traveled(self) -> float | None:
+        """Return seconds the cover has moved in the travel in progress, its startup delay excluded."""
+        if self.travel_direction is TravelStatus.STOPPED:
+            return None
+        return max(self.current_time() - self._movement_start, 0.0)
+
+    def time_to_next_change(self, step: int = 1) -> float | None:
+        """Return seconds until the position moves by `step` or reaches its target."""
+        if self.travel_direction is TravelStatus.STOPPED:
+            return None
+        now = self.current_time()
+        if self._travel_time == 0 or now >= self._movement_start + self._travel_time:
+            return 0.0
+        return max(self._next_change_at(self._calculate_position(now), step) - now, 0.0)
+
+    def _next_change_at(self, position: int, step: int = 1) -> float:
+        """Return when the position, now `position`, moves by `step` or reaches its target."""
+        relative_position = self._relative_position
+        sign = 1 if relative_position > 0 else -1
+        next_position = position + sign * max(step, 1)
+        if (next_position - self.travel_to_position) * sign >= 0:
+            return self._movement_start + self._travel_time
+
+        # The rounded position changes when the exact one crosses the half-way mark.
+        boundary = next_position - sign * 0.5
+        if self.curve is not None:
+            progress = (self.curve.time_at(boundary) - self._curve_from) / self._curve_span
+        else:
+            progress = (boundary - self.last_known_position) / relative_position
+        return self._movement_start + self._travel_time * progress
+
     def _calculate_travel_time(self, relative_position: int) -> float:
         """Calculate time to travel to relative position."""
         if relative_position == 0:
             return 0
-        
-        travel_direction = (
-            TravelStatus.DIRECTION_UP
-            if relative_position > 0
-            else TravelStatus.DIRECTION_DOWN
-        )
+
         travel_time_full = (
             self.travel_time_up
-            if travel_direction == TravelStatus.DIRECTION_UP
+            if relative_position > 0
             else self.travel_time_down
         )
         travel_range = self.position_open - self.position_closed
-        
+
         if travel_range == 0:
             return 0
 
         return travel_time_full * abs(relative_position) / travel_range
 
+    def _prepare_move(self) -> None:
+        """Precompute the current move and invalidate cached positions."""
+        self._relative_position = self.travel_to_position - self.last_known_position
+        curve = self.curve
+        if curve is not None and self._relative_position:
+            self._curve_from = curve.time_at(self.last_known_position)
+            self._curve_span = curve.time_at(self.travel_to_position) - self._curve_from
+            travel_time_full = self.travel_time_up if self._relative_position > 0 else self.travel_time_down
+            self._travel_time = travel_time_full * abs(self._curve_span)
+        else:
+            self._curve_from = self._curve_span = None
+            self._travel_time = self._calculate_travel_time(self._relative_position)
+        self._movement_start = self.travel_started_time + self.startup_delay
+        self._memo_time = None
+        self._memo_position = None
+
     def current_time(self) -> float:
         """Get current time. May be modified from outside (for unit tests)."""
         if self.time_set_from_outside is not None:
             return self.time_set_from_outside
-        return time.time()
+        if self.pinned_time is not None:
+            return self.pinned_time
+        return clock()
 
     def __eq__(self, other):
         """Equal operator."""
-        return self.__dict__ == other.__dict__
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in self.__slots__
+            if not name.startswith("_memo")
+        )
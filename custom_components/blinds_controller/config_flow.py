@@ -1,8 +1,125 @@
+import asyncio
+import csv
+import io
+
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import callback
+from homeassistant.components.file_upload import process_uploaded_file
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
+    FileSelector,
+    FileSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
+from homeassistant.util.yaml import parse_yaml
+
+from .const import (
+    DEFAULT_COMMAND_RETRIES,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_POWER_THRESHOLD,
+    DEFAULT_RECORDER_INTERVAL,
+    DEFAULT_SWITCH_DEBOUNCE,
+    DOMAIN,
+    RECORDER_MODE_ALL,
+    RECORDER_MODES,
+    UPDATE_MODE_INTERVAL,
+    UPDATE_MODES,
+)
+
+
+# Pickers searching the entities in the frontend, instead of a list of all of
+# them sent with every form.
+SWITCH_SELECTOR = EntitySelector(EntitySelectorConfig(domain="switch"))
+POWER_SENSOR_SELECTOR = EntitySelector(EntitySelectorConfig(domain="sensor"))
+
+# One blind of a bulk import, with the defaults of the setup form
+BLIND_SCHEMA = vol.Schema(
+    {
+        vol.Required("ent_name"): cv.string,
+        vol.Required("entity_up"): cv.entity_domain("switch"),
+        vol.Required("entity_down"): cv.entity_domain("switch"),
+        vol.Required("time_up"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Required("time_down"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("tilt_open", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("tilt_closed", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("startup_delay", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+        vol.Optional("send_stop_at_end", default=True): cv.boolean,
+        vol.Optional("update_mode", default=UPDATE_MODE_INTERVAL): vol.In(UPDATE_MODES),
+        vol.Optional("min_update_interval", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+        vol.Optional("recorder_mode", default=RECORDER_MODE_ALL): vol.In(RECORDER_MODES),
+        vol.Optional("recorder_interval", default=DEFAULT_RECORDER_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=600)),
+        vol.Optional("switch_debounce", default=DEFAULT_SWITCH_DEBOUNCE): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+        vol.Optional("circuit"): cv.string,
+        vol.Optional("priority", default=0): vol.All(vol.Coerce(int), vol.Range(min=-10, max=10)),
+        vol.Optional("position_step", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional("command_timeout", default=DEFAULT_COMMAND_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=60)),
+        vol.Optional("command_retries", default=DEFAULT_COMMAND_RETRIES): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+        vol.Optional("power_sensor"): cv.entity_domain("sensor"),
+        vol.Optional("power_threshold", default=DEFAULT_POWER_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("metrics_sensors", default=False): cv.boolean,
+    }
+)
+
+
+def parse_blinds(text: str) -> list[dict]:
+    """Parse and validate a table of blinds.
+
+    The table is a YAML list of blinds, a YAML mapping of names to blinds, or
+    CSV with a header row. The keys are those of the setup form, `name` is
+    accepted for `ent_name`. Raise vol.Invalid naming every invalid row.
+    """
+    try:
+        rows = parse_yaml(text)
+    except HomeAssistantError:
+        rows = None
+    if isinstance(rows, dict):
+        rows = [{"ent_name": name, **(blind or {})} for name, blind in rows.items()]
+    elif not isinstance(rows, list):
+        rows = list(csv.DictReader(io.StringIO(text.strip())))
+    if not rows:
+        raise vol.Invalid("no blinds found")
 
-from .const import DOMAIN
+    blinds = []
+    problems = []
+    relays = set()
+    for number, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            problems.append(f"row {number}: not a blind")
+            continue
+        # Empty CSV cells take the defaults.
+        row = {
+            str(key).strip(): value.strip() if isinstance(value, str) else value
+            for key, value in row.items()
+            if key is not None and value not in (None, "")
+        }
+        if "name" in row:
+            row.setdefault("ent_name", row.pop("name"))
+        try:
+            blind = BLIND_SCHEMA(row)
+        except vol.Invalid as err:
+            problems.append(f"row {number}: {err}")
+            continue
+        pair = (blind["entity_up"], blind["entity_down"])
+        if pair in relays:
+            problems.append(f"row {number}: {pair[0]} and {pair[1]} are listed twice")
+            continue
+        relays.add(pair)
+        blinds.append(blind)
+    if problems:
+        raise vol.Invalid("; ".join(problems))
+    return blinds
+
+
+def _read_uploaded_file(hass: HomeAssistant, file_id: str) -> str:
+    """Return the text of an uploaded file."""
+    with process_uploaded_file(hass, file_id) as path:
+        return path.read_text(encoding="utf-8")
 
 
 class BlindsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -16,13 +133,12 @@ class BlindsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Get the options flow for this handler."""
         return BlindsOptionsFlow(config_entry)
 
-    @callback
-    def _get_entity_ids(self, platform="switch"):
-        """Return a sorted list of entity IDs for a given platform."""
-        return sorted(self.hass.states.async_entity_ids(platform))
-
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["blind", "bulk"])
+
+    async def async_step_blind(self, user_input=None):
+        """Add one blind."""
         errors = {}
         if user_input is not None:
             return self.async_create_entry(
@@ -30,28 +146,97 @@ class BlindsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data=user_input,
             )
 
-        all_switches = self._get_entity_ids("switch")
-        if not all_switches:
+        if not self.hass.states.async_entity_ids_count("switch"):
             errors["base"] = "no_switches"
             
         return self.async_show_form(
-            step_id="user",
+            step_id="blind",
             data_schema=vol.Schema(
                 {
                     vol.Required("ent_name"): str,
-                    vol.Required("entity_up"): vol.In(all_switches),
-                    vol.Required("entity_down"): vol.In(all_switches),
+                    vol.Required("entity_up"): SWITCH_SELECTOR,
+                    vol.Required("entity_down"): SWITCH_SELECTOR,
                     vol.Required("time_up"): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Required("time_down"): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Optional("tilt_open", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Optional("tilt_closed", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Optional("startup_delay", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
                     vol.Optional("send_stop_at_end", default=True): bool,
+                    vol.Optional("update_mode", default=UPDATE_MODE_INTERVAL): vol.In(UPDATE_MODES),
+                    vol.Optional("min_update_interval", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+                    vol.Optional("recorder_mode", default=RECORDER_MODE_ALL): vol.In(RECORDER_MODES),
+                    vol.Optional("recorder_interval", default=DEFAULT_RECORDER_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=600)),
+                    vol.Optional("switch_debounce", default=DEFAULT_SWITCH_DEBOUNCE): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                    vol.Optional("circuit"): str,
+                    vol.Optional("priority", default=0): vol.All(vol.Coerce(int), vol.Range(min=-10, max=10)),
+                    vol.Optional("position_step", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                    vol.Optional("command_timeout", default=DEFAULT_COMMAND_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=60)),
+                    vol.Optional("command_retries", default=DEFAULT_COMMAND_RETRIES): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+                    vol.Optional("power_sensor"): POWER_SENSOR_SELECTOR,
+                    vol.Optional("power_threshold", default=DEFAULT_POWER_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional("metrics_sensors", default=False): bool,
                 }
             ),
             errors=errors,
         )
 
+    async def async_step_bulk(self, user_input=None):
+        """Add many blinds at once from a pasted or uploaded table."""
+        errors = {}
+        problems = ""
+        if user_input is not None:
+            text = user_input.get("table", "")
+            if file_id := user_input.get("file"):
+                text = await self.hass.async_add_executor_job(_read_uploaded_file, self.hass, file_id)
+            try:
+                blinds = parse_blinds(text)
+            except vol.Invalid as err:
+                errors["base"] = "invalid_table"
+                problems = str(err)
+            else:
+                configured = {
+                    (entry.data.get("entity_up"), entry.data.get("entity_down"))
+                    for entry in self._async_current_entries()
+                }
+                new_blinds = []
+                for blind in blinds:
+                    # A row repeating the switches of an earlier one is skipped too.
+                    switches = (blind["entity_up"], blind["entity_down"])
+                    if switches not in configured:
+                        configured.add(switches)
+                        new_blinds.append(blind)
+                # Each blind is its own entry, created by an import flow. They
+                # are all set up together.
+                results = await asyncio.gather(
+                    *(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN, context={"source": config_entries.SOURCE_IMPORT}, data=blind
+                        )
+                        for blind in new_blinds
+                    )
+                )
+                # An import aborts when its blind was configured meanwhile.
+                added = sum(result["type"] == FlowResultType.CREATE_ENTRY for result in results)
+                return self.async_abort(reason="bulk_added", description_placeholders={"count": str(added)})
+
+        return self.async_show_form(
+            step_id="bulk",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional("table"): TextSelector(TextSelectorConfig(multiline=True)),
+                    vol.Optional("file"): FileSelector(FileSelectorConfig(accept=".csv,.yaml,.yml,.txt")),
+                }
+            ),
+            errors=errors,
+            description_placeholders={"problems": problems},
+        )
+
+    async def async_step_import(self, import_data):
+        """Add a blind of a bulk import."""
+        blind = BLIND_SCHEMA(import_data)
+        self._async_abort_entries_match({"entity_up": blind["entity_up"], "entity_down": blind["entity_down"]})
+        return self.async_create_entry(title=blind["ent_name"], data=blind)
+
 
 class BlindsOptionsFlow(config_entries.OptionsFlow):
     """Handle an options flow for Blinds Controller."""
@@ -63,32 +248,45 @@ class BlindsOptionsFlow(config_entries.OptionsFlow):
         super().__init__()
         self.config_entry = config_entry
 
-    @callback
-    def _get_entity_ids(self, platform="switch"):
-        """Return a sorted list of entity IDs for a given platform."""
-        return sorted(self.hass.states.async_entity_ids(platform))
-
     async def async_step_init(self, user_input=None):
         """Manage the options."""
         if user_input is not None:
-            # Update the existing entry with the new data
+            # Update the existing entry with the new data, keeping the
+            # calibration recorded by the record_calibration_point service.
+            if "travel_curve" in self.config_entry.options:
+                user_input["travel_curve"] = self.config_entry.options["travel_curve"]
+            # A cleared optional field is left out of the input. Store it as
+            # None, or the cover falls back to the value the entry was set up with.
+            for key in ("circuit", "power_sensor"):
+                user_input.setdefault(key, None)
             return self.async_create_entry(title="", data=user_input)
 
-        all_switches = self._get_entity_ids("switch")
-
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Required("ent_name", default=self.config_entry.options.get("ent_name", self.config_entry.data.get("ent_name"))): str,
-                    vol.Required("entity_up", default=self.config_entry.options.get("entity_up", self.config_entry.data.get("entity_up"))): vol.In(all_switches),
-                    vol.Required("entity_down", default=self.config_entry.options.get("entity_down", self.config_entry.data.get("entity_down"))): vol.In(all_switches),
+                    vol.Required("entity_up", default=self.config_entry.options.get("entity_up", self.config_entry.data.get("entity_up"))): SWITCH_SELECTOR,
+                    vol.Required("entity_down", default=self.config_entry.options.get("entity_down", self.config_entry.data.get("entity_down"))): SWITCH_SELECTOR,
                     vol.Required("time_up", default=self.config_entry.options.get("time_up", self.config_entry.data.get("time_up"))): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Required("time_down", default=self.config_entry.options.get("time_down", self.config_entry.data.get("time_down"))): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Optional("tilt_open", default=self.config_entry.options.get("tilt_open", self.config_entry.data.get("tilt_open", 0.0))): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Optional("tilt_closed", default=self.config_entry.options.get("tilt_closed", self.config_entry.data.get("tilt_closed", 0.0))): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Optional("startup_delay", default=self.config_entry.options.get("startup_delay", self.config_entry.data.get("startup_delay", 0.0))): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
                     vol.Optional("send_stop_at_end", default=self.config_entry.options.get("send_stop_at_end", self.config_entry.data.get("send_stop_at_end", True))): bool,
+                    vol.Optional("update_mode", default=self.config_entry.options.get("update_mode", self.config_entry.data.get("update_mode", UPDATE_MODE_INTERVAL))): vol.In(UPDATE_MODES),
+                    vol.Optional("min_update_interval", default=self.config_entry.options.get("min_update_interval", self.config_entry.data.get("min_update_interval", 0.0))): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+                    vol.Optional("recorder_mode", default=self.config_entry.options.get("recorder_mode", self.config_entry.data.get("recorder_mode", RECORDER_MODE_ALL))): vol.In(RECORDER_MODES),
+                    vol.Optional("recorder_interval", default=self.config_entry.options.get("recorder_interval", self.config_entry.data.get("recorder_interval", DEFAULT_RECORDER_INTERVAL))): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=600)),
+                    vol.Optional("switch_debounce", default=self.config_entry.options.get("switch_debounce", self.config_entry.data.get("switch_debounce", DEFAULT_SWITCH_DEBOUNCE))): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                    vol.Optional("circuit", description={"suggested_value": self.config_entry.options.get("circuit", self.config_entry.data.get("circuit"))}): str,
+                    vol.Optional("priority", default=self.config_entry.options.get("priority", self.config_entry.data.get("priority", 0))): vol.All(vol.Coerce(int), vol.Range(min=-10, max=10)),
+                    vol.Optional("position_step", default=self.config_entry.options.get("position_step", self.config_entry.data.get("position_step", 1))): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                    vol.Optional("command_timeout", default=self.config_entry.options.get("command_timeout", self.config_entry.data.get("command_timeout", DEFAULT_COMMAND_TIMEOUT))): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=60)),
+                    vol.Optional("command_retries", default=self.config_entry.options.get("command_retries", self.config_entry.data.get("command_retries", DEFAULT_COMMAND_RETRIES))): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+                    vol.Optional("power_sensor", description={"suggested_value": self.config_entry.options.get("power_sensor", self.config_entry.data.get("power_sensor"))}): POWER_SENSOR_SELECTOR,
+                    vol.Optional("power_threshold", default=self.config_entry.options.get("power_threshold", self.config_entry.data.get("power_threshold", DEFAULT_POWER_THRESHOLD))): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional("metrics_sensors", default=self.config_entry.options.get("metrics_sensors", self.config_entry.data.get("metrics_sensors", False))): bool,
                 }
             ),
         )
@@ -1,3 +1,80 @@
 # const.py
 
 DOMAIN = "blinds_controller"
+
+# Keys of the shared objects stored in hass.data[DOMAIN]
+DATA_COORDINATOR = "coordinator"
+DATA_RELAY_DRIVER = "relay_driver"
+DATA_COVERS = "covers"
+DATA_MOTION_STORE = "motion_store"
+DATA_METRICS = "metrics"
+DATA_SWITCH_ROUTER = "switch_router"
+DATA_ADMISSION = "admission"
+
+# Keys of the YAML configuration of the domain: the most motors running at
+# once, over all covers and per circuit named in the cover options
+CONF_MAX_RUNNING_MOTORS = "max_running_motors"
+CONF_CIRCUITS = "circuits"
+
+# Relays switched by publishing to MQTT directly, by switch entity ID, and
+# the keys of their configuration, named as for an MQTT switch
+CONF_MQTT_RELAYS = "mqtt_relays"
+CONF_COMMAND_TOPIC = "command_topic"
+CONF_STATE_TOPIC = "state_topic"
+CONF_PAYLOAD_ON = "payload_on"
+CONF_PAYLOAD_OFF = "payload_off"
+CONF_STATE_ON = "state_on"
+CONF_STATE_OFF = "state_off"
+CONF_QOS = "qos"
+CONF_RETAIN = "retain"
+
+# Delay coalescing the saves of the motion store, in seconds
+MOTION_SAVE_DELAY = 1.0
+
+# Interval of the shared motion tick, in seconds
+UPDATE_INTERVAL = 0.1
+
+# Position update scheduling
+UPDATE_MODE_INTERVAL = "interval"
+UPDATE_MODE_EVENT = "event"
+UPDATE_MODES = [UPDATE_MODE_INTERVAL, UPDATE_MODE_EVENT]
+
+# Recording of the intermediate positions of a travel: every update, at most
+# one per interval, or only the start, stop and final states
+RECORDER_MODE_ALL = "all"
+RECORDER_MODE_THROTTLED = "throttled"
+RECORDER_MODE_ENDPOINTS = "endpoints"
+RECORDER_MODES = [RECORDER_MODE_ALL, RECORDER_MODE_THROTTLED, RECORDER_MODE_ENDPOINTS]
+DEFAULT_RECORDER_INTERVAL = 5.0
+
+# Granularity used to coalesce event driven updates due at nearly the same time
+EVENT_RESOLUTION = 0.01
+
+# Weight of a new sample in the rolling relay latency estimate
+LATENCY_SMOOTHING = 0.2
+
+# Window in which the state changes of a switch are coalesced, in seconds
+DEFAULT_SWITCH_DEBOUNCE = 0.0
+
+# Default number of covers commanded at once by bulk services
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Relay command execution
+# Pause between releasing one direction relay and engaging the other, in seconds
+INTERLOCK_DELAY = 0.1
+DEFAULT_COMMAND_TIMEOUT = 5.0
+DEFAULT_COMMAND_RETRIES = 2
+# Delay before the first retry of a failed relay command, doubled on every further retry
+RETRY_BACKOFF = 0.2
+# A round-trip this many times the estimate is reported as an outlier
+LATENCY_OUTLIER_FACTOR = 3.0
+
+# Power meter auto-calibration
+DEFAULT_POWER_THRESHOLD = 5.0
+# Weight of a new run in the travel time estimate
+CALIBRATION_SMOOTHING = 0.3
+# Runs accepted before runs off the estimate by more than the tolerance are rejected
+CALIBRATION_MIN_SAMPLES = 3
+CALIBRATION_TOLERANCE = 0.25
+# Shortest run, in percent of the travel, a travel time is derived from
+CALIBRATION_MIN_TRAVEL = 25
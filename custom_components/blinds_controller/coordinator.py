@@ -0,0 +1,148 @@
+import heapq
+import itertools
+import logging
+import math
+from asyncio import TimerHandle
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_COORDINATOR,
+    DOMAIN,
+    EVENT_RESOLUTION,
+    UPDATE_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant) -> "MotionCoordinator":
+    """Return the motion coordinator shared by all blinds of the domain."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    coordinator = domain_data.get(DATA_COORDINATOR)
+    if coordinator is None:
+        coordinator = domain_data[DATA_COORDINATOR] = MotionCoordinator(hass)
+    return coordinator
+
+
+class MotionCoordinator:
+    """Drive the position updates of all moving covers from a single timer.
+
+    Every moving cover has a due time on the event loop clock. Covers in
+    interval mode are due on a shared grid of `UPDATE_INTERVAL`, covers in
+    event mode, or recording fewer states, at the instant their next state
+    write is computed to be needed. One timer
+    is armed for the earliest due time, so loop wakeups depend on time and not
+    on the number of moving covers. Only the covers due at a wakeup are
+    evaluated.
+    """
+
+    def __init__(self, hass: HomeAssistant, interval: float = UPDATE_INTERVAL):
+        """Initialize the coordinator."""
+        self.hass = hass
+        self._interval = interval
+        self._moving = {}
+        self._due = {}
+        self._queue = []
+        self._sequence = itertools.count()
+        self._timer: TimerHandle | None = None
+        self._timer_due: float | None = None
+
+    @property
+    def moving_count(self) -> int:
+        """Return the number of covers currently tracked."""
+        return len(self._moving)
+
+    @callback
+    def async_add(self, cover) -> None:
+        """Start tracking a moving cover."""
+        self._moving[id(cover)] = cover
+        self._async_schedule(cover, self.hass.loop.time())
+        self._async_arm_timer()
+
+    @callback
+    def async_remove(self, cover) -> None:
+        """Stop tracking a cover, cancelling the timer once nothing moves."""
+        self._moving.pop(id(cover), None)
+        self._due.pop(id(cover), None)
+        if not self._moving:
+            self._async_cancel_timer()
+
+    @callback
+    def async_reschedule(self, cover) -> None:
+        """Recompute the next update of a cover, e.g. after its target changed."""
+        if id(cover) in self._moving:
+            self._async_schedule(cover, self.hass.loop.time())
+            self._async_arm_timer()
+
+    @callback
+    def _async_schedule(self, cover, now: float) -> None:
+        """Compute the due time of a cover on the loop clock."""
+        if cover.schedules_by_event:
+            delay = cover.next_update_delay()
+            if delay is None:
+                self._due.pop(id(cover), None)
+                return
+            # Round up to a coarse grid so covers due at nearly the same
+            # instant share a wakeup, and never land before the change.
+            due = math.ceil((now + delay) / EVENT_RESOLUTION + 1e-3) * EVENT_RESOLUTION
+        else:
+            # The epsilon keeps a tick from landing on itself when the
+            # division falls just short of a whole number.
+            due = (math.floor(now / self._interval + 1e-6) + 1) * self._interval
+
+        self._due[id(cover)] = due
+        heapq.heappush(self._queue, (due, next(self._sequence), id(cover)))
+
+    @callback
+    def _async_arm_timer(self) -> None:
+        """Arm the timer for the earliest due cover."""
+        # Drop queue entries that were superseded or whose cover stopped.
+        while self._queue and self._due.get(self._queue[0][2]) != self._queue[0][0]:
+            heapq.heappop(self._queue)
+        if not self._queue:
+            self._async_cancel_timer()
+            return
+
+        due = self._queue[0][0]
+        if self._timer is not None:
+            if self._timer_due <= due:
+                return
+            self._timer.cancel()
+        self._timer_due = due
+        self._timer = self.hass.loop.call_at(due, self._async_fire)
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_due = None
+
+    @callback
+    def _async_fire(self) -> None:
+        """Update every due cover and write their states in one pass."""
+        self._timer = None
+        self._timer_due = None
+        now = self.hass.loop.time()
+        utc_now = dt_util.utcnow()
+
+        due_covers = []
+        while self._queue and self._queue[0][0] <= now:
+            due, _, key = heapq.heappop(self._queue)
+            if self._due.get(key) == due:
+                del self._due[key]
+                due_covers.append(key)
+
+        for key in due_covers:
+            cover = self._moving.get(key)
+            if cover is None:
+                continue
+            cover.auto_updater_hook(utc_now)
+            # The hook removes covers that reached their target.
+            if key in self._moving:
+                self._async_schedule(cover, now)
+
+        self._async_arm_timer()
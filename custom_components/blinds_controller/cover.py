@@ -17,44 +17,58 @@ from homeassistant.const import (
     STATE_ON, # Import STATE_ON
     STATE_OFF,
 )
-from homeassistant.core import callback, HomeAssistant, Event
+from homeassistant.core import callback, HomeAssistant, Event, State
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.event import async_track_time_interval, async_track_state_change_event
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.device_registry import DeviceInfo
-import voluptuous as vol
+from homeassistant.util import dt as dt_util
 
-from .calculator import TravelCalculator, TravelStatus
-from .const import DOMAIN
+from .admission import async_get_admission
+from .calculator import PositionType, TravelCalculator, TravelCurve, TravelStatus, clock
+from .const import (
+    CALIBRATION_MIN_TRAVEL,
+    CALIBRATION_TOLERANCE,
+    DATA_COVERS,
+    DEFAULT_COMMAND_RETRIES,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_POWER_THRESHOLD,
+    DEFAULT_RECORDER_INTERVAL,
+    DEFAULT_SWITCH_DEBOUNCE,
+    DOMAIN,
+    EVENT_RESOLUTION,
+    INTERLOCK_DELAY,
+    RECORDER_MODE_ALL,
+    RECORDER_MODE_ENDPOINTS,
+    RECORDER_MODE_THROTTLED,
+    UPDATE_MODE_EVENT,
+    UPDATE_MODE_INTERVAL,
+)
+from .coordinator import async_get_coordinator
+from .metrics import SIGNAL_METRICS_UPDATED, async_get_metrics
+from .planner import MotionPhase, plan_motion
+from .power import MOTOR_START, MOTOR_STOP, MotorEdgeDetector, TravelTimeEstimator
+from .relay import RelayCommandError, async_get_relay_driver
+from .router import async_get_switch_router
+from .store import async_get_motion_store, calc_to_record, restore_calc
 
 _LOGGER = logging.getLogger(__name__)
 
-SERVICE_SET_KNOWN_POSITION = "set_known_position"
-SERVICE_SET_KNOWN_TILT_POSITION = "set_known_tilt_position"
-
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up the blinds cover from a config entry."""
+    # The entity services are domain services, registered once in async_setup.
     async_add_entities([BlindsCover(hass, entry)])
 
-    platform = entity_platform.async_get_current_platform()
-
-    platform.async_register_entity_service(
-        SERVICE_SET_KNOWN_POSITION,
-        {vol.Required("position"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100))},
-        "async_set_known_position",
-    )
-    platform.async_register_entity_service(
-        SERVICE_SET_KNOWN_TILT_POSITION,
-        {vol.Required("position"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100))},
-        "async_set_known_tilt_position",
-    )
-
 
 class BlindsCover(CoverEntity, RestoreEntity):
     """Representation of a blinds cover."""
 
+    # Relay timing changes with every command, it is in the diagnostics.
+    _unrecorded_attributes = frozenset({"relay_latency_up", "relay_latency_down", "stop_overshoot"})
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
         """Initialize the cover."""
         self.hass = hass
@@ -75,20 +89,46 @@ class BlindsCover(CoverEntity, RestoreEntity):
         )
 
         self._configure_entity()
-        
-        self._unsubscribe_auto_updater = None
-        # --- NEW: Add flag to prevent feedback loops and variable for listeners ---
-        self._is_handling_command = False
-        self._remove_listeners = None
+
+        self._coordinator = async_get_coordinator(hass)
+        self._admission = async_get_admission(hass)
+        self._auto_updater_running = False
+        self._end_stop_handle = None
+        self._end_stop_arrival = None
+        self._end_stop_latency = 0.0
+        self._end_stop_task = None
+        self._active_switch_entity_id = None
+        self._relay_stopped_at = None
+        self._last_stop_overshoot = None
+        self._last_command_error = None
+        # Number of commands being sent, their switch changes are not external.
+        self._commands_in_flight = 0
+        self._command_task = None
+        self._relay_command = None
+        self._motor_started_at = None
+        self._metrics = async_get_metrics(hass, entry.entry_id)
+        self._remove_power_listener = None
+        self._power_detector = None
+        self._power_run = None
+        self._travel_estimators = {}
+        self._motion_store = async_get_motion_store(hass)
+        self._saved_motion = None
+        self._trajectories = {}
+        # Runs left in the motion plan being executed, and how long the travel
+        # of the current run waits for the slats.
+        self._pending_phases = []
+        self._travel_offset = 0.0
+        # Callers waiting for the travel to a position to end, and the travels
+        # held while the motor waits for its admission, with their targets.
+        self._arrival_waiters: list[tuple[int, asyncio.Future]] = []
+        self._held_travel: list[tuple[TravelCalculator, int]] = []
 
         self.travel_calc = TravelCalculator(
-            self._travel_time_down, self._travel_time_up, self._startup_delay
+            self._travel_time_down, self._travel_time_up, self._startup_delay, curve=self._travel_curve,
         )
         self.tilt_calc = None
         if self.has_tilt_support():
-            self.tilt_calc = TravelCalculator(
-                self._travel_tilt_closed, self._travel_tilt_open, self._startup_delay
-            )
+            self.tilt_calc = TravelCalculator(self._travel_tilt_closed, self._travel_tilt_open, self._startup_delay)
 
     def _configure_entity(self):
         """Read configuration from options or data."""
@@ -100,12 +140,84 @@ class BlindsCover(CoverEntity, RestoreEntity):
         self._up_switch_entity_id = self.entry.options.get("entity_up", self.entry.data.get("entity_up"))
         self._down_switch_entity_id = self.entry.options.get("entity_down", self.entry.data.get("entity_down"))
         self._send_stop_at_end = self.entry.options.get("send_stop_at_end", self.entry.data.get("send_stop_at_end", True))
+        self.update_mode = self.entry.options.get("update_mode", self.entry.data.get("update_mode", UPDATE_MODE_INTERVAL))
+        self._min_update_interval = self.entry.options.get("min_update_interval", self.entry.data.get("min_update_interval", 0.0))
+        self.switch_debounce = self.entry.options.get("switch_debounce", self.entry.data.get("switch_debounce", DEFAULT_SWITCH_DEBOUNCE))
+        self._circuit = self.entry.options.get("circuit", self.entry.data.get("circuit")) or None
+        self._priority = self.entry.options.get("priority", self.entry.data.get("priority", 0))
+        self.recorder_mode = self.entry.options.get("recorder_mode", self.entry.data.get("recorder_mode", RECORDER_MODE_ALL))
+        self._recorder_interval = self.entry.options.get("recorder_interval", self.entry.data.get("recorder_interval", DEFAULT_RECORDER_INTERVAL))
+        self._position_step = self.entry.options.get("position_step", self.entry.data.get("position_step", 1))
+        self._command_timeout = self.entry.options.get("command_timeout", self.entry.data.get("command_timeout", DEFAULT_COMMAND_TIMEOUT))
+        self._command_retries = self.entry.options.get("command_retries", self.entry.data.get("command_retries", DEFAULT_COMMAND_RETRIES))
+        self._metrics_sensors = self.entry.options.get("metrics_sensors", self.entry.data.get("metrics_sensors", False))
+        self._power_sensor_entity_id = self.entry.options.get("power_sensor", self.entry.data.get("power_sensor"))
+        self._power_threshold = self.entry.options.get("power_threshold", self.entry.data.get("power_threshold", DEFAULT_POWER_THRESHOLD))
+        self._travel_curve = self._compile_travel_curve(
+            self.entry.options.get("travel_curve", self.entry.data.get("travel_curve"))
+        )
+
+    def _compile_travel_curve(self, points: dict | None) -> TravelCurve | None:
+        """Compile the calibration points, position to seconds from fully closed."""
+        if not points:
+            return None
+        try:
+            return TravelCurve(points.items(), self._travel_time_up)
+        except ValueError as err:
+            _LOGGER.warning("Cover %s: ignoring the travel calibration: %s", self._attr_name, err)
+            return None
+
+    async def async_options_updated(self, hass: HomeAssistant, entry: ConfigEntry):
+        """Apply changed options to the live entity."""
+        switches = (self._up_switch_entity_id, self._down_switch_entity_id)
+        new_switches = (
+            entry.options.get("entity_up", entry.data.get("entity_up")),
+            entry.options.get("entity_down", entry.data.get("entity_down")),
+        )
+        if new_switches != switches and self._auto_updater_running:
+            # The old relays drive the motor, they have to stop it.
+            await self.async_stop_cover()
+
+        had_tilt = self.has_tilt_support()
+        power = (self._power_sensor_entity_id, self._power_threshold)
+        metrics_sensors = self._metrics_sensors
+        self._configure_entity()
+        if self._metrics_sensors != metrics_sensors:
+            # Adding or removing entities is the one change needing a reload.
+            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+            return
+        self._attr_name = entry.options.get("ent_name", entry.data.get("ent_name"))
+
+        self.travel_calc.set_travel_times(
+            self._travel_time_down, self._travel_time_up, self._startup_delay, self._travel_curve
+        )
+        if self.has_tilt_support():
+            if had_tilt:
+                self.tilt_calc.set_travel_times(self._travel_tilt_closed, self._travel_tilt_open, self._startup_delay)
+            else:
+                self.tilt_calc = TravelCalculator(self._travel_tilt_closed, self._travel_tilt_open, self._startup_delay)
+        elif had_tilt:
+            self.tilt_calc = None
+
+        if new_switches != switches:
+            self._relay_command = None
+            self._active_switch_entity_id = None
+            self._async_track_switches()
+        if (self._power_sensor_entity_id, self._power_threshold) != power:
+            self._async_track_power()
+        else:
+            self._async_sync_travel_estimators()
+
+        if self._auto_updater_running:
+            self._coordinator.async_reschedule(self)
+            self._arm_end_stop()
+        self.async_write_ha_state()
+
+    @property
+    def switch_entity_ids(self) -> tuple[str, str]:
+        """Return the switches driving the cover up and down."""
+        return self._up_switch_entity_id, self._down_switch_entity_id
 
-    @staticmethod
-    async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry):
-        """Handle options update."""
-        await hass.config_entries.async_reload(entry.entry_id)
-        
     @property
     def supported_features(self) -> CoverEntityFeature:
         """Flag supported features."""
@@ -127,15 +239,59 @@ class BlindsCover(CoverEntity, RestoreEntity):
     @property
     def current_cover_position(self) -> int | None:
         """Return current position of cover."""
+        if self.travel_calc.position_type is PositionType.UNKNOWN:
+            return None
         return self.travel_calc.current_position()
 
     @property
     def current_cover_tilt_position(self) -> int | None:
         """Return current tilt position of cover."""
-        if self.has_tilt_support():
+        if self.has_tilt_support() and self.tilt_calc.position_type is not PositionType.UNKNOWN:
             return self.tilt_calc.current_position()
         return None
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the relay timing and health of the cover, and its motion plans."""
+        attributes = {
+            "relay_latency_up": round(self._relays.latency(self._up_switch_entity_id).estimate, 3),
+            "relay_latency_down": round(self._relays.latency(self._down_switch_entity_id).estimate, 3),
+            "stop_overshoot": None if self._last_stop_overshoot is None else round(self._last_stop_overshoot, 3),
+            "last_command_error": self._last_command_error,
+            "trajectory": self._trajectory_attribute("travel", self.travel_calc),
+        }
+        if self.has_tilt_support():
+            attributes["tilt_trajectory"] = self._trajectory_attribute("tilt", self.tilt_calc)
+        return attributes
+
+    def _trajectory_attribute(self, name: str, calc: TravelCalculator) -> dict | None:
+        """Return the plan of a travel, for clients interpolating the position themselves.
+
+        The times are on the wall clock. The plan is converted once per travel,
+        so it stays identical in every state written while it lasts.
+        """
+        trajectory = calc.trajectory()
+        if trajectory is None:
+            self._trajectories.pop(name, None)
+            return None
+        cached = self._trajectories.get(name)
+        if cached is not None and cached[0] == trajectory:
+            return cached[1]
+
+        start, target, started, startup_delay, duration = trajectory
+        started_at = dt_util.utcnow() - timedelta(seconds=calc.current_time() - started)
+        attribute = {
+            "start_position": start,
+            "target_position": target,
+            "started_at": started_at.isoformat(),
+            "startup_delay": startup_delay,
+            # Mean rate in percent per second, signed. A calibrated travel is not linear.
+            "rate": round((target - start) / duration, 3) if duration else None,
+            "arrival_at": (started_at + timedelta(seconds=startup_delay + duration)).isoformat(),
+        }
+        self._trajectories[name] = (trajectory, attribute)
+        return attribute
+
     @property
     def is_opening(self) -> bool:
         """Return if the cover is opening or not."""
@@ -147,23 +303,106 @@ class BlindsCover(CoverEntity, RestoreEntity):
         return self.travel_calc.travel_direction == TravelStatus.DIRECTION_DOWN
 
     @property
-    def is_closed(self) -> bool:
+    def is_closed(self) -> bool | None:
         """Return if the cover is closed or not."""
+        if self.travel_calc.position_type is PositionType.UNKNOWN:
+            return None
         return self.travel_calc.is_closed()
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, evaluating every position read at the same instant."""
+        calcs = [calc for calc in (self.travel_calc, self.tilt_calc) if calc is not None]
+        now = clock()
+        for calc in calcs:
+            calc.pinned_time = now
+        self._metrics.state_writes += 1
+        try:
+            super().async_write_ha_state()
+        finally:
+            for calc in calcs:
+                calc.pinned_time = None
+        self._async_save_motion()
+        if self._arrival_waiters:
+            self._async_resolve_arrivals()
+
+    @callback
+    def _async_resolve_arrivals(self, stopped_at: int | None = None) -> None:
+        """Complete the waits for travels that reached their target or were interrupted.
+
+        `stopped_at` is the target of a travel the end stop just ended.
+        """
+        calc = self.travel_calc
+        moving, destination = calc.travel_direction is not TravelStatus.STOPPED, calc.travel_to_position
+        for held, target in self._held_travel:
+            if held is calc:
+                moving, destination = True, target
+        waiting = []
+        for target, waiter in self._arrival_waiters:
+            if waiter.done():
+                continue
+            if moving and destination == target:
+                waiting.append((target, waiter))
+            else:
+                waiter.set_result(not moving and target in (calc.current_position(), stopped_at))
+        self._arrival_waiters = waiting
+
+    @callback
+    def _async_save_motion(self) -> None:
+        """Hand the travel state to the motion store when it changed."""
+        calcs = {"travel": self.travel_calc, "tilt": self.tilt_calc}
+        motion = tuple(
+            (calc.last_known_position, calc.travel_to_position, calc.travel_started_time,
+             calc.travel_direction, calc.position_type)
+            for calc in calcs.values()
+            if calc is not None
+        )
+        if motion != self._saved_motion:
+            self._saved_motion = motion
+            self._motion_store.async_set(
+                self.entry.entry_id,
+                {key: calc_to_record(calc) for key, calc in calcs.items() if calc is not None},
+            )
+
+    @callback
+    def _async_restore_motion(self, record: dict) -> None:
+        """Restore the travel state, resuming a travel whose relay is still on."""
+        resumed = None
+        for key, calc in (("travel", self.travel_calc), ("tilt", self.tilt_calc)):
+            if calc is None or record.get(key) is None:
+                continue
+            direction = TravelStatus[record[key]["direction"]]
+            switch_entity_id = (
+                self._up_switch_entity_id
+                if direction is TravelStatus.DIRECTION_UP
+                else self._down_switch_entity_id
+            )
+            state = self.hass.states.get(switch_entity_id)
+            if restore_calc(calc, record[key], state is not None and state.state == STATE_ON):
+                resumed = switch_entity_id
+
+        if resumed is not None:
+            _LOGGER.debug("Cover %s resumes the travel interrupted by the restart", self.name)
+            self._active_switch_entity_id = resumed
+            self._relay_command = (
+                SERVICE_OPEN_COVER if resumed == self._up_switch_entity_id else SERVICE_CLOSE_COVER
+            )
+            self._admission.claim(self, self._circuit)
+            self.start_auto_updater()
+
     async def async_open_cover(self, **kwargs):
         """Open the cover."""
         if self.travel_calc.current_position() < 100:
-            self.travel_calc.start_travel_up()
+            self._start_travel(self.travel_calc.position_open)
             self.start_auto_updater()
-            await self._async_handle_command(SERVICE_OPEN_COVER)
+            await self._async_send_command(SERVICE_OPEN_COVER)
 
     async def async_close_cover(self, **kwargs):
         """Close cover."""
         if self.travel_calc.current_position() > 0:
-            self.travel_calc.start_travel_down()
+            self._start_travel(self.travel_calc.position_closed)
             self.start_auto_updater()
-            await self._async_handle_command(SERVICE_CLOSE_COVER)
+            await self._async_send_command(SERVICE_CLOSE_COVER)
     
     async def async_stop_cover(self, **kwargs):
         """Stop the cover."""
@@ -171,11 +410,55 @@ class BlindsCover(CoverEntity, RestoreEntity):
         if self.has_tilt_support():
             self.tilt_calc.stop()
         self.stop_auto_updater()
-        await self._async_handle_command(SERVICE_STOP_COVER)
+        await self._async_send_command(SERVICE_STOP_COVER)
 
     async def async_set_cover_position(self, **kwargs):
         """Move the cover to a specific position."""
-        position = kwargs[ATTR_POSITION]
+        command = self.start_move(kwargs[ATTR_POSITION])
+        if command:
+            await self._async_send_command(command)
+
+    async def async_move_to_position(self, position: int, wait: bool = False) -> dict:
+        """Move the cover to `position` and return when it is due to arrive.
+
+        Without `wait`, respond at once with the arrival estimated from now,
+        as if a motor queued by the admission started at once. With `wait`, the arrival is
+        computed once the drive relay confirmed the start, and the response
+        comes only when the travel ends, with whether it reached the position
+        or was interrupted.
+        """
+        started = clock()
+        waiter = None
+        command = self.start_move(position)
+        # Take a free slot right away, so the covers of one call queue in order.
+        queued = command in (SERVICE_OPEN_COVER, SERVICE_CLOSE_COVER) and not self._admission.try_acquire(
+            self, self._circuit
+        )
+        if command and wait:
+            waiter = self.hass.loop.create_future()
+            self._arrival_waiters.append((position, waiter))
+            await self._async_send_command(command)
+        elif command:
+            self.hass.async_create_task(self._async_send_command_unawaited(command))
+
+        calc = self.travel_calc
+        eta = 0.0
+        if calc.travel_direction is not TravelStatus.STOPPED and calc.travel_to_position == position:
+            eta = calc.time_to_target()
+        response = {
+            "target_position": position,
+            "eta": round(eta, 3),
+            "queued": queued,
+            "arrival_at": (dt_util.utcnow() + timedelta(seconds=eta)).isoformat(),
+        }
+        if wait:
+            response["reached"] = True if waiter is None else await waiter
+            response["waited"] = round(clock() - started, 3)
+            response["final_position"] = self.current_cover_position
+        return response
+
+    def start_move(self, position: int, now: float | None = None) -> str | None:
+        """Start tracking a move to `position` and return the command to send, if any."""
         current_position = self.travel_calc.current_position()
 
         command = None
@@ -185,9 +468,36 @@ class BlindsCover(CoverEntity, RestoreEntity):
             command = SERVICE_CLOSE_COVER
 
         if command:
-            self.travel_calc.start_travel(position)
+            self._start_travel(position, now)
             self.start_auto_updater()
-            await self._async_handle_command(command)
+        return command
+
+    async def async_send_move(self, command: str) -> bool:
+        """Send the command of a move started with `start_move`.
+
+        Return False when a newer command superseded it.
+        """
+        return await self._async_send_command(command)
+
+    def _start_travel(self, position: int, now: float | None = None) -> None:
+        """Start tracking a travel to `position`, at `now` if given.
+
+        When the relays already drive the motor that way, the travel goes on
+        to the new target without a second startup delay.
+        """
+        calc = self.travel_calc
+        if position > calc.current_position():
+            direction, command = TravelStatus.DIRECTION_UP, SERVICE_OPEN_COVER
+        else:
+            direction, command = TravelStatus.DIRECTION_DOWN, SERVICE_CLOSE_COVER
+        if (
+            calc.travel_direction is direction
+            and command == self._relay_command
+            and self._admission.is_admitted(self)
+        ):
+            calc.retarget(position, now)
+        else:
+            calc.start_travel(position, now)
 
     def has_tilt_support(self) -> bool:
         """Check if tilt is supported."""
@@ -198,14 +508,14 @@ class BlindsCover(CoverEntity, RestoreEntity):
         if self.has_tilt_support() and self.tilt_calc.current_position() < 100:
             self.tilt_calc.start_travel_up()
             self.start_auto_updater()
-            await self._async_handle_command(SERVICE_OPEN_COVER)
+            await self._async_send_command(SERVICE_OPEN_COVER)
 
     async def async_close_cover_tilt(self, **kwargs):
         """Close the cover tilt."""
         if self.has_tilt_support() and self.tilt_calc.current_position() > 0:
             self.tilt_calc.start_travel_down()
             self.start_auto_updater()
-            await self._async_handle_command(SERVICE_CLOSE_COVER)
+            await self._async_send_command(SERVICE_CLOSE_COVER)
 
     async def async_stop_cover_tilt(self, **kwargs):
         """Stop the cover tilt."""
@@ -228,132 +538,678 @@ class BlindsCover(CoverEntity, RestoreEntity):
         if command:
             self.tilt_calc.start_travel(position)
             self.start_auto_updater()
-            await self._async_handle_command(command)
+            await self._async_send_command(command)
+
+    async def async_set_position_and_tilt(self, position: int | None = None, tilt_position: int | None = None):
+        """Move the cover to a position and tilt in one planned relay sequence."""
+        tilt_calc = self.tilt_calc if self.has_tilt_support() else None
+        phases = plan_motion(
+            self.travel_calc.current_position(),
+            position,
+            None if tilt_calc is None else tilt_calc.current_position(),
+            tilt_position,
+            self._travel_tilt_open,
+            self._travel_tilt_closed,
+        )
+        if phases:
+            command = self._async_start_phase(phases[0])
+            await self._async_send_command(command, phases=phases[1:])
+
+    @callback
+    def _async_start_phase(self, phase: MotionPhase, now: float | None = None) -> str:
+        """Start tracking one run of a motion plan, at `now` if given, and return its command."""
+        if now is None:
+            now = clock()
+        for calc, target, offset in (
+            (self.travel_calc, phase.position, phase.offset),
+            (self.tilt_calc, phase.tilt, 0.0),
+        ):
+            if calc is None:
+                continue
+            if target is None or target == calc.current_position():
+                if calc.travel_direction is not TravelStatus.STOPPED:
+                    calc.stop(now)
+            else:
+                calc.start_travel(target, now + offset)
+        self._travel_offset = phase.offset
+        self.start_auto_updater()
+        return phase.command
 
     def start_auto_updater(self):
-        """Start the auto updater to update HASS state."""
-        if self._unsubscribe_auto_updater is None:
-            interval = timedelta(seconds=0.1)
-            self._unsubscribe_auto_updater = async_track_time_interval(
-                self.hass, self.auto_updater_hook, interval
-            )
+        """Register the cover with the shared motion tick."""
+        if not self._auto_updater_running:
+            self._auto_updater_running = True
+            self._coordinator.async_add(self)
+        else:
+            self._coordinator.async_reschedule(self)
+        self._arm_end_stop()
 
     def stop_auto_updater(self):
-        """Stop the auto updater."""
-        if self._unsubscribe_auto_updater is not None:
-            self._unsubscribe_auto_updater()
-            self._unsubscribe_auto_updater = None
+        """Unregister the cover from the shared motion tick."""
+        self._cancel_end_stop()
+        if self._auto_updater_running:
+            self._auto_updater_running = False
+            self._coordinator.async_remove(self)
+
+    def _moving_calcs(self) -> list[TravelCalculator]:
+        """Return the calculators that are currently traveling."""
+        return [
+            calc
+            for calc in (self.travel_calc, self.tilt_calc)
+            if calc is not None and calc.travel_direction != TravelStatus.STOPPED
+        ]
+
+    def _arm_end_stop(self) -> None:
+        """Schedule the end-of-travel stop, ahead of the arrival by the relay latency.
+
+        A travel to fully open or closed is stopped at its arrival instead,
+        so a relay answering faster than estimated cannot leave the blind
+        short of its end limit.
+        """
+        self._cancel_end_stop()
+        moving_calcs = self._moving_calcs()
+        # The next run of a plan reverses the relays at the same moment.
+        if not (self._send_stop_at_end or self._pending_phases) or not moving_calcs:
+            return
+
+        direction = moving_calcs[0].travel_direction
+        switch_entity_id = (
+            self._up_switch_entity_id
+            if direction == TravelStatus.DIRECTION_UP
+            else self._down_switch_entity_id
+        )
+        latency = self._relays.latency(switch_entity_id).estimate
+
+        loop = self.hass.loop
+        self._end_stop_arrival = loop.time() + max(calc.time_to_target() for calc in moving_calcs)
+        self._end_stop_latency = latency
+        due = self._end_stop_arrival - latency
+        if self._travels_to_end_limit():
+            due = self._end_stop_arrival
+            if self._power_detector is not None:
+                # The power drop at the end limit ends the travel, so that a
+                # travel time set too short is learned too. The stop only
+                # guards against a sensor that never reports it.
+                calc = self.travel_calc
+                travel_time = calc.travel_time_up if direction is TravelStatus.DIRECTION_UP else calc.travel_time_down
+                due = self._end_stop_arrival + CALIBRATION_TOLERANCE * travel_time
+                self._end_stop_arrival = None
+        self._end_stop_handle = loop.call_at(due, self._async_end_stop_due)
+
+    def _travels_to_end_limit(self) -> bool:
+        """Return if the travel in progress ends at the fully open or closed end limit."""
+        calc = self.travel_calc
+        return (
+            not self._pending_phases
+            and calc.travel_direction is not TravelStatus.STOPPED
+            and calc.travel_to_position in (calc.position_open, calc.position_closed)
+        )
+
+    def _cancel_end_stop(self) -> None:
+        """Cancel a pending end-of-travel stop."""
+        if self._end_stop_handle is not None:
+            self._end_stop_handle.cancel()
+            self._end_stop_handle = None
 
     @callback
-    def auto_updater_hook(self, now: datetime) -> None:
-        """Call for the updater."""
-        self.async_schedule_update_ha_state()
+    def _async_end_stop_due(self) -> None:
+        """Send the stop command armed for the end of the travel."""
+        self._end_stop_handle = None
+        self._end_stop_task = self.hass.async_create_task(
+            self._async_end_stop(self._end_stop_arrival)
+        )
+
+    async def _async_end_stop(self, arrival: float | None) -> None:
+        """Stop the relays and record how far past the arrival the motor ran."""
+        # A stop sent within the relay latency of the arrival was timed to
+        # halt the motor on the target, however fast the relay answers.
+        on_target = arrival is not None and arrival - self.hass.loop.time() <= self._end_stop_latency + EVENT_RESOLUTION
+        try:
+            if self._pending_phases:
+                # Reverse straight into the next run of the plan instead of
+                # stopping. The relays switch over at the arrival, the motor
+                # restarts after the interlock.
+                phase, *phases = self._pending_phases
+                drive = self._up_switch_entity_id if phase.command == SERVICE_OPEN_COVER else self._down_switch_entity_id
+                start = arrival - self.hass.loop.time() + clock() + INTERLOCK_DELAY + self._relays.latency(drive).estimate
+                await self._async_send_command(self._async_start_phase(phase, start), phases=phases)
+                return
+            _LOGGER.debug("Auto-stopping cover %s as it reaches its final position.", self.name)
+            if not await self._async_send_end_stop(arrival):
+                # A newer command took over the relays, the travel goes on.
+                return
+        finally:
+            self._end_stop_task = None
 
-        position_reached = self.travel_calc.position_reached() and \
-                           (not self.has_tilt_support() or self.tilt_calc.position_reached())
+        if self._auto_updater_running:
+            self.stop_auto_updater()
+            target = self.travel_calc.travel_to_position
+            for calc in self._moving_calcs():
+                if on_target:
+                    calc.stop(calc.current_time() + calc.time_to_target())
+                else:
+                    calc.stop()
+            # The end stop ended the travel it was armed for, a position a
+            # step off the target still counts as arrived.
+            self._async_resolve_arrivals(stopped_at=target)
+        self.async_write_ha_state()
+
+    @property
+    def schedules_by_event(self) -> bool:
+        """Return if the updates follow the position changes instead of a fixed tick."""
+        return self.update_mode == UPDATE_MODE_EVENT or self.recorder_mode != RECORDER_MODE_ALL
+
+    def next_update_delay(self) -> float | None:
+        """Return seconds until the next state write needed in event mode."""
+        delays = [
+            calc.time_to_next_change(self._position_step)
+            for calc in (self.travel_calc, self.tilt_calc)
+            if calc is not None and calc.travel_direction != TravelStatus.STOPPED
+        ]
+        if not delays:
+            return 0.0
 
-        if position_reached:
+        arrival = min(
+            calc.time_to_target()
+            for calc in (self.travel_calc, self.tilt_calc)
+            if calc is not None and calc.travel_direction != TravelStatus.STOPPED
+        )
+        if self.recorder_mode == RECORDER_MODE_ENDPOINTS:
+            # Intermediate positions are not written, only the arrival.
+            return arrival
+        spacing = self._min_update_interval
+        if self.recorder_mode == RECORDER_MODE_THROTTLED:
+            spacing = max(spacing, self._recorder_interval)
+        # Keep the requested spacing between updates, but never delay the arrival.
+        return min(max(min(delays), spacing), arrival)
+
+    @callback
+    def auto_updater_hook(self, now: datetime) -> None:
+        """Update the cover on a tick of the shared motion coordinator."""
+        self._metrics.ticks += 1
+
+        # The rounded position shows the target a little before the arrival,
+        # only the exact arrival ends the travel. An armed end stop ends it
+        # itself, at the arrival less the relay latency.
+        moving_calcs = self._moving_calcs()
+        arrived = all(calc.time_to_target() == 0 for calc in moving_calcs)
+        if arrived and self._end_stop_handle is None and self._end_stop_task is None:
+            arrival = self._arrival_time(moving_calcs)
             self.stop_auto_updater()
             self.travel_calc.stop()
             if self.has_tilt_support():
                 self.tilt_calc.stop()
-            
-            self.hass.async_create_task(self.auto_stop_if_necessary())
-            
-            self.async_write_ha_state()
 
-    async def auto_stop_if_necessary(self):
+            self.hass.async_create_task(self.auto_stop_if_necessary(arrival))
+            if not self._send_stop_at_end:
+                # The end limit of the motor stops it.
+                self._admission.release(self)
+
+        self.async_write_ha_state()
+
+    def _arrival_time(self, calcs: list[TravelCalculator]) -> float | None:
+        """Return when the travels of `calcs` end, on the event loop clock."""
+        trajectories = [calc.trajectory() for calc in calcs]
+        if not trajectories:
+            return None
+        arrival = max(started + startup_delay + duration for _, _, started, startup_delay, duration in trajectories)
+        # The calculators run on the monotonic clock, the relay timing on the loop clock.
+        return self.hass.loop.time() - clock() + arrival
+
+    async def auto_stop_if_necessary(self, arrival: float | None = None):
         """Send stop command if required."""
         if self._send_stop_at_end:
             _LOGGER.debug("Auto-stopping cover %s as it reached its final position.", self.name)
-            await self._async_handle_command(SERVICE_STOP_COVER)
-            
+            await self._async_send_end_stop(arrival)
+
+    async def _async_send_end_stop(self, arrival: float | None) -> bool:
+        """Stop the relays at the end of a travel and record how far past `arrival` the motor ran.
+
+        Return False when a newer command took over the relays.
+        """
+        self._relay_stopped_at = None
+        if not await self._async_send_command(SERVICE_STOP_COVER):
+            return False
+        if arrival is not None and self._relay_stopped_at is not None:
+            self._last_stop_overshoot = self._relay_stopped_at - arrival
+            self._metrics.stop_overshoot.add(abs(self._last_stop_overshoot))
+        return True
+
+    @property
+    def _relays(self):
+        """Return the relay driver shared by all covers."""
+        return async_get_relay_driver(self.hass)
+
+    @property
+    def _is_handling_command(self) -> bool:
+        """Return if relay commands of this cover are in flight."""
+        return self._commands_in_flight > 0
+
+    async def _async_send_command(self, command: str, phases: list[MotionPhase] | None = None) -> bool:
+        """Send a command through the per-cover pipeline.
+
+        A newer command cancels the one still in flight, so a burst of
+        requests only drives the relays to the latest one. Moving on in the
+        direction the relays already drive sends nothing at all. `phases` are
+        the runs of a motion plan to follow this command, any other command
+        drops them. Return False when the command was superseded before it
+        completed.
+        """
+        if phases is None:
+            self._travel_offset = 0.0
+        self._pending_phases = phases or []
+        if command != SERVICE_STOP_COVER and command == self._relay_command and self._admission.is_admitted(self):
+            return True
+
+        previous = self._command_task
+        if previous is not None and not previous.done():
+            _LOGGER.debug("Cover %s: %s supersedes the command in flight", self.name, command)
+            previous.cancel()
+
+        self._relay_command = command
+        task = self._command_task = self.hass.async_create_task(self._async_handle_command(command))
+        try:
+            await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            return False
+        except RelayCommandError as err:
+            if self._command_task is task:
+                self._relay_command = None
+                self._async_command_failed(command, err)
+            raise
+        except Exception:
+            if self._command_task is task:
+                self._relay_command = None
+            raise
+        finally:
+            if self._command_task is task:
+                self._command_task = None
+
+        self._last_command_error = None
+        if command != SERVICE_STOP_COVER and self._auto_updater_running:
+            # The relay latency estimate just got a new sample.
+            self._arm_end_stop()
+        return True
+
+    async def _async_send_command_unawaited(self, command: str) -> None:
+        """Send a command nobody waits for, its failure is already reported."""
+        try:
+            await self._async_send_command(command)
+        except RelayCommandError:
+            pass
+
+    @callback
+    def _async_command_failed(self, command: str, err: RelayCommandError) -> None:
+        """Stop tracking a motion the relays did not confirm."""
+        _LOGGER.error("Cover %s: %s failed: %s", self.name, command, err)
+        self._last_command_error = str(err)
+        if command != SERVICE_STOP_COVER:
+            # Without a confirmation the motor is assumed not to have started.
+            now = clock()
+            for calc in self._moving_calcs():
+                calc.confirm_travel(now)
+                calc.stop()
+            self.stop_auto_updater()
+        # Whatever state the motor is in, a slot it never gives back would
+        # hold back every queued cover.
+        self._admission.release(self)
+        self.async_write_ha_state()
+
+    @callback
+    def _async_motion_confirmed(self) -> None:
+        """Start the tracked travel at the moment the drive relay confirmed."""
+        now = clock()
+        for calc in self._moving_calcs():
+            calc.confirm_travel(now + self._travel_offset if calc is self.travel_calc else now)
+        self._async_start_power_run(now + self._travel_offset)
+        if self._auto_updater_running:
+            self._coordinator.async_reschedule(self)
+
+    async def _async_admit_motor(self) -> None:
+        """Wait until the motor may start, holding the travel while queued.
+
+        The tracked travel starts again from where the cover stands once the
+        motor is admitted, with the start confirmed by the drive relay.
+        """
+        if self._admission.try_acquire(self, self._circuit):
+            return
+        held = [(calc, calc.travel_to_position) for calc in self._moving_calcs()]
+        for calc, _ in held:
+            calc.stop()
+        self.stop_auto_updater()
+        self._held_travel = held
+        try:
+            self.async_write_ha_state()
+            waited = await self._admission.async_acquire(self, self._circuit, self._priority)
+        finally:
+            self._held_travel = []
+        _LOGGER.debug("Cover %s: motor admitted after %.2f s", self.name, waited)
+        self._metrics.admission_wait.add(waited)
+        now = clock()
+        for calc, target in held:
+            calc.start_travel(target, now + self._travel_offset if calc is self.travel_calc else now)
+        if held:
+            self.start_auto_updater()
+
     async def _async_handle_command(self, command: str) -> None:
         """Handle the cover commands."""
-        # --- MODIFIED: Use the feedback loop flag ---
-        self._is_handling_command = True
+        limits = {"timeout": self._command_timeout, "retries": self._command_retries}
+        if command in (SERVICE_OPEN_COVER, SERVICE_CLOSE_COVER):
+            # Every motor start passes the domain-wide admission. The switches
+            # are not ours while queued, so wall switch changes are followed.
+            await self._async_admit_motor()
+        self._commands_in_flight += 1
         try:
             if command == SERVICE_OPEN_COVER:
-                await self.hass.services.async_call("switch", "turn_off", {"entity_id": self._down_switch_entity_id}, blocking=True)
-                await asyncio.sleep(0.1) # Interlock delay
-                await self.hass.services.async_call("switch", "turn_on", {"entity_id": self._up_switch_entity_id}, blocking=True)
+                if await self._async_relay(False, self._down_switch_entity_id, limits):
+                    self._async_record_motor_run()
+                    await asyncio.sleep(INTERLOCK_DELAY)
+                if await self._async_relay(True, self._up_switch_entity_id, limits):
+                    self._async_motion_confirmed()
+                self._active_switch_entity_id = self._up_switch_entity_id
+                self._motor_started_at = self._motor_started_at or self.hass.loop.time()
             elif command == SERVICE_CLOSE_COVER:
-                await self.hass.services.async_call("switch", "turn_off", {"entity_id": self._up_switch_entity_id}, blocking=True)
-                await asyncio.sleep(0.1) # Interlock delay
-                await self.hass.services.async_call("switch", "turn_on", {"entity_id": self._down_switch_entity_id}, blocking=True)
+                if await self._async_relay(False, self._up_switch_entity_id, limits):
+                    self._async_record_motor_run()
+                    await asyncio.sleep(INTERLOCK_DELAY)
+                if await self._async_relay(True, self._down_switch_entity_id, limits):
+                    self._async_motion_confirmed()
+                self._active_switch_entity_id = self._down_switch_entity_id
+                self._motor_started_at = self._motor_started_at or self.hass.loop.time()
             elif command == SERVICE_STOP_COVER:
-                await self.hass.services.async_call("switch", "turn_off", {"entity_id": self._up_switch_entity_id}, blocking=True)
-                await self.hass.services.async_call("switch", "turn_off", {"entity_id": self._down_switch_entity_id}, blocking=True)
+                # Release the relay that drives the motor first, it is what stops it.
+                first, second = self._up_switch_entity_id, self._down_switch_entity_id
+                if self._active_switch_entity_id == second:
+                    first, second = second, first
+                if await self._async_relay(False, first, limits):
+                    # A relay still held by other covers keeps the motor running.
+                    self._relay_stopped_at = self.hass.loop.time()
+                self._power_run = None
+                self._async_record_motor_run()
+                self._admission.release(self)
+                await self._async_relay(False, second, limits)
+                self._active_switch_entity_id = None
         finally:
-            self._is_handling_command = False
-            
+            self._commands_in_flight -= 1
+
         self.async_write_ha_state()
+        async_dispatcher_send(self.hass, SIGNAL_METRICS_UPDATED.format(self.entry.entry_id))
+
+    async def _async_relay(self, on: bool, entity_id: str, limits: dict) -> bool:
+        """Switch a relay through the driver and record the command sent, if any."""
+        if on:
+            sent = await self._relays.async_turn_on(entity_id, self.entity_id, **limits)
+        else:
+            sent = await self._relays.async_turn_off(entity_id, self.entity_id, **limits)
+        if sent:
+            self._metrics.relay_commands += 1
+            self._metrics.relay_latency.add(self._relays.latency(entity_id).last)
+        return sent
+
+    @callback
+    def _async_record_motor_run(self) -> None:
+        """Add the run of the motor that just stopped to its runtime."""
+        if self._motor_started_at is not None:
+            self._metrics.motor_runtime += self.hass.loop.time() - self._motor_started_at
+            self._motor_started_at = None
 
     async def async_added_to_hass(self):
         """Call when entity is added to hass."""
         await super().async_added_to_hass()
-        old_state = await self.async_get_last_state()
-        if old_state and old_state.attributes.get(ATTR_CURRENT_POSITION) is not None:
+        self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COVERS, {})[self.entity_id] = self
+        record = await self._motion_store.async_get(self.entry.entry_id)
+        old_state = None if record is not None else await self.async_get_last_state()
+        if record is not None:
+            self._async_restore_motion(record)
+        elif old_state and old_state.attributes.get(ATTR_CURRENT_POSITION) is not None:
             self.travel_calc.set_position(int(old_state.attributes.get(ATTR_CURRENT_POSITION)))
             if self.has_tilt_support() and old_state.attributes.get(ATTR_CURRENT_TILT_POSITION) is not None:
                 self.tilt_calc.set_position(int(old_state.attributes.get(ATTR_CURRENT_TILT_POSITION)))
 
-        # --- NEW: Set up the state listeners ---
-        self._remove_listeners = async_track_state_change_event(
-            self.hass,
-            [self._up_switch_entity_id, self._down_switch_entity_id],
-            self._async_switch_state_changed,
+        self._async_track_switches()
+        self._async_track_power()
+
+    @callback
+    def _async_track_switches(self) -> None:
+        """Have the state changes of the configured switches routed to the cover."""
+        async_get_switch_router(self.hass).async_add(
+            self, [self._up_switch_entity_id, self._down_switch_entity_id]
         )
 
     # --- NEW: Add cleanup for when the entity is removed ---
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass."""
-        if self._remove_listeners:
-            self._remove_listeners()
+        self.hass.data[DOMAIN].get(DATA_COVERS, {}).pop(self.entity_id, None)
+        self.stop_auto_updater()
+        async_get_switch_router(self.hass).async_remove(self)
+        self._admission.release(self)
+        for _, waiter in self._arrival_waiters:
+            if not waiter.done():
+                waiter.set_result(False)
+        self._arrival_waiters = []
+        if self._remove_power_listener:
+            self._remove_power_listener()
 
-    # --- NEW: The handler for switch state changes ---
-# In your BlindsCover class in cover.py
+    @callback
+    def _async_track_power(self) -> None:
+        """Subscribe to the power sensor used to learn the travel times, if any."""
+        if self._remove_power_listener:
+            self._remove_power_listener()
+            self._remove_power_listener = None
+        self._power_run = None
+        self._travel_estimators = {}
+        if not self._power_sensor_entity_id:
+            self._power_detector = None
+            return
+        self._power_detector = MotorEdgeDetector(self._power_threshold)
+        self._async_sync_travel_estimators()
+        self._remove_power_listener = async_track_state_change_event(
+            self.hass, [self._power_sensor_entity_id], self._async_power_changed
+        )
+
+    @callback
+    def _async_sync_travel_estimators(self) -> None:
+        """Restart the estimators whose travel time was changed by hand."""
+        if self._power_detector is None:
+            return
+        for direction, travel_time in (
+            (TravelStatus.DIRECTION_UP, self._travel_time_up),
+            (TravelStatus.DIRECTION_DOWN, self._travel_time_down),
+        ):
+            estimator = self._travel_estimators.get(direction)
+            if estimator is None or round(estimator.estimate, 2) != travel_time:
+                self._travel_estimators[direction] = TravelTimeEstimator(travel_time)
+
+    @callback
+    def _async_start_power_run(self, now: float) -> None:
+        """Time the motor run the drive relay started at `now`, when learning the travel times."""
+        calc = self.travel_calc
+        self._power_run = None
+        if self._power_detector is not None and calc.travel_direction is not TravelStatus.STOPPED:
+            # Started, from where, which way, and whether the motor was seen
+            # drawing power, which it may report before the relay confirms.
+            self._power_run = [now, calc.last_known_position, calc.travel_direction, self._power_detector.running]
+
+    @callback
+    def _async_power_changed(self, event: Event) -> None:
+        """Time the motor runs from the drive relay turning on to the power drop."""
+        new_state = event.data.get("new_state")
+        try:
+            power = float(new_state.state)
+        except (AttributeError, TypeError, ValueError):
+            return
+        edge = self._power_detector.feed(power)
+        run = self._power_run
+        if edge is None or run is None:
+            return
 
-# (All other code remains the same)
+        if edge == MOTOR_START:
+            run[3] = True
+        elif edge == MOTOR_STOP and run[3]:
+            # A drop before the motor was seen running is the motor of the
+            # previous run slowing down.
+            self._power_run = None
+            started, from_position, direction, _ = run
+            self._async_motor_stopped(clock() - started, from_position, direction)
 
-    # --- MODIFIED: The handler for switch state changes ---
     @callback
-    async def _async_switch_state_changed(self, event: Event) -> None:
-        """Handle the switch state changes."""
-        # Import STATE_OFF at the top of the file if not already present
-        from homeassistant.const import STATE_OFF
+    def _async_motor_stopped(self, run_time: float, from_position: int, direction: TravelStatus) -> None:
+        """Learn the travel time from a motor that stopped at its end limit.
+
+        Only a run that ends while the relay still drives the motor towards a
+        fully open or closed target tells the travel time; runs cut by a stop
+        command do not. The run is timed from the relay, so it does not matter
+        whether the tracked travel arrived before or after the motor stopped.
+        """
+        calc = self.travel_calc
+        drive = SERVICE_OPEN_COVER if direction is TravelStatus.DIRECTION_UP else SERVICE_CLOSE_COVER
+        end = calc.position_open if direction is TravelStatus.DIRECTION_UP else calc.position_closed
+        if self._relay_command != drive or calc.travel_to_position != end:
+            return
+
+        if abs(end - from_position) >= CALIBRATION_MIN_TRAVEL:
+            if calc.curve is not None:
+                share = abs(calc.curve.time_at(end) - calc.curve.time_at(from_position))
+            else:
+                share = abs(end - from_position) / (calc.position_open - calc.position_closed)
+            estimator = self._travel_estimators[direction]
+            if not estimator.add((run_time - calc.startup_delay) / share):
+                _LOGGER.debug("Cover %s: ignoring a motor run of %.2f s", self.name, run_time)
+                return
+
+            key = "time_up" if direction is TravelStatus.DIRECTION_UP else "time_down"
+            _LOGGER.debug("Cover %s: %s learned as %.2f s", self.name, key, estimator.estimate)
+            # Applied in place by async_options_updated.
+            self.hass.config_entries.async_update_entry(
+                self.entry, options={**self.entry.options, key: round(estimator.estimate, 2)}
+            )
+        self.hass.async_create_task(self._async_end_limit_reached(end))
+
+    async def _async_end_limit_reached(self, end: int) -> None:
+        """Release the relays of a motor that stopped at its end limit."""
+        await self.async_stop_cover()
+        self.travel_calc.set_position(end)
+        self.async_write_ha_state()
 
+    @callback
+    def async_switch_changed(self, entity_id: str, new_state: State) -> None:
+        """Handle a state change of a switch, routed by the switch event router."""
         # Ignore changes that this entity triggered itself
         if self._is_handling_command:
+            self._metrics.external_ignored += 1
             return
 
-        entity_id = event.data.get("entity_id")
-        new_state = event.data.get("new_state")
+        # A late echo of our own command leaves the relays where we put them.
+        if (new_state.state == STATE_ON) == (entity_id == self._active_switch_entity_id):
+            return
+        # The relays no longer are where our last command left them.
+        self._relay_command = None
+        self._metrics.external_handled += 1
+        if self._command_task is not None and not self._command_task.done():
+            # No relay call is in flight, so the command waits for a motor
+            # slot. The wall switch overrides it.
+            _LOGGER.debug("Cover %s: external switch command cancels the queued command", self.name)
+            self._command_task.cancel()
+            self._command_task = None
 
-        if not new_state:
+        # A switch turned on drives the cover, one turned off while moving stops it.
+        if new_state.state == STATE_ON and entity_id == self._up_switch_entity_id:
+            _LOGGER.debug("Cover %s is opening due to external switch command.", self.name)
+            command, start = SERVICE_OPEN_COVER, self.async_open_cover
+        elif new_state.state == STATE_ON and entity_id == self._down_switch_entity_id:
+            _LOGGER.debug("Cover %s is closing due to external switch command.", self.name)
+            command, start = SERVICE_CLOSE_COVER, self.async_close_cover
+        elif new_state.state == STATE_OFF and (self.is_opening or self.is_closing):
+            _LOGGER.debug("Cover %s is stopping due to external switch command.", self.name)
+            command, start = SERVICE_STOP_COVER, self.async_stop_cover
+        else:
             return
 
-        # If a switch was turned ON, trigger the corresponding cover action
-        if new_state.state == STATE_ON:
-            if entity_id == self._up_switch_entity_id:
-                _LOGGER.debug("Cover %s is opening due to external switch command.", self.name)
-                await self.async_open_cover()
-            elif entity_id == self._down_switch_entity_id:
-                _LOGGER.debug("Cover %s is closing due to external switch command.", self.name)
-                await self.async_close_cover()
-        
-        # --- NEW: If a switch was turned OFF while the cover was moving, stop it ---
-        elif new_state.state == STATE_OFF:
-            # Check if the cover was actually moving
-            if self.is_opening or self.is_closing:
-                _LOGGER.debug("Cover %s is stopping due to external switch command.", self.name)
-                await self.async_stop_cover()
+        if not self._async_follow_relays(command):
+            self.hass.async_create_task(start())
+
+    @callback
+    def _async_follow_relays(self, command: str) -> bool:
+        """Track a command the relays already carried out, e.g. from a wall switch.
+
+        Return False when relays have to be commanded, i.e. the command must
+        go through the pipeline.
+        """
+        if self._command_task is not None and not self._command_task.done():
+            return False
+        up, down = self._up_switch_entity_id, self._down_switch_entity_id
+        position = self.travel_calc.current_position()
+        if command == SERVICE_OPEN_COVER:
+            if position >= 100:
+                return True
+            drive, relays = up, {"on": (up,), "off": (down,)}
+        elif command == SERVICE_CLOSE_COVER:
+            if position <= 0:
+                return True
+            drive, relays = down, {"on": (down,), "off": (up,)}
+        else:
+            drive, relays = None, {"off": (up, down)}
+        if not self._relays.async_follow(self.entity_id, **relays):
+            return False
+        self._pending_phases = []
+        self._travel_offset = 0.0
+        if drive is not None:
+            # The motor runs whatever the limits, it holds a slot until it stops.
+            self._admission.claim(self, self._circuit)
+
+        if command == SERVICE_OPEN_COVER:
+            self.travel_calc.start_travel_up()
+            self.start_auto_updater()
+            self._motor_started_at = self._motor_started_at or self.hass.loop.time()
+            self._async_start_power_run(clock())
+        elif command == SERVICE_CLOSE_COVER:
+            self.travel_calc.start_travel_down()
+            self.start_auto_updater()
+            self._motor_started_at = self._motor_started_at or self.hass.loop.time()
+            self._async_start_power_run(clock())
+        else:
+            self.travel_calc.stop()
+            if self.has_tilt_support():
+                self.tilt_calc.stop()
+            self.stop_auto_updater()
+            self._async_record_motor_run()
+            self._admission.release(self)
+        self._relay_command = command
+        self._active_switch_entity_id = drive
+        self.async_write_ha_state()
+        return True
 
     async def async_set_known_position(self, position: int):
         """Service to set the known position of the cover."""
         self.travel_calc.set_position(position)
         self.async_write_ha_state()
 
+    async def async_record_calibration_point(self, position: int, time: float | None = None, clear: bool = False):
+        """Service to record when the cover reaches `position`, in seconds from fully closed.
+
+        Without `time`, the cover must be opening from fully closed and the
+        time elapsed since its motor started is recorded.
+        """
+        if time is None:
+            calc = self.travel_calc
+            if calc.travel_direction is not TravelStatus.DIRECTION_UP or calc.last_known_position != calc.position_closed:
+                raise HomeAssistantError(f"{self.entity_id} is not opening from fully closed")
+            time = calc.time_traveled()
+
+        points = {} if clear else dict(self.entry.options.get("travel_curve", self.entry.data.get("travel_curve", {})))
+        points[str(position)] = round(time, 3)
+        try:
+            TravelCurve(points.items(), self._travel_time_up)
+        except ValueError as err:
+            raise HomeAssistantError(f"Invalid calibration point for {self.entity_id}: {err}") from err
+
+        # Applied in place by async_options_updated.
+        self.hass.config_entries.async_update_entry(
+            self.entry, options={**self.entry.options, "travel_curve": points}
+        )
+
     async def async_set_known_tilt_position(self, position: int):
         """Service to set the known tilt position of the cover."""
         if self.has_tilt_support():
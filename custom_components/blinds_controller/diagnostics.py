@@ -0,0 +1,73 @@
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .calculator import TravelCalculator
+from .const import DATA_ADMISSION, DATA_COORDINATOR, DATA_COVERS, DATA_RELAY_DRIVER, DATA_SWITCH_ROUTER, DOMAIN
+from .metrics import async_get_metrics
+
+
+def _calculator_snapshot(calc: TravelCalculator | None) -> dict | None:
+    """Return the state of a calculator, with the position at this instant."""
+    if calc is None:
+        return None
+    return {
+        "current_position": calc.current_position(),
+        "position_type": calc.position_type.name,
+        "last_known_position": calc.last_known_position,
+        "travel_to_position": calc.travel_to_position,
+        "travel_direction": calc.travel_direction.name,
+        "travel_started_time": calc.travel_started_time,
+        "travel_time_up": calc.travel_time_up,
+        "travel_time_down": calc.travel_time_down,
+        "startup_delay": calc.startup_delay,
+        "time_to_target": calc.time_to_target(),
+        "curve": None if calc.curve is None else dict(zip(calc.curve.positions, calc.curve.times)),
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    cover = next(
+        (
+            cover
+            for cover in domain_data.get(DATA_COVERS, {}).values()
+            if cover.entry.entry_id == entry.entry_id
+        ),
+        None,
+    )
+
+    diagnostics = {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "metrics": async_get_metrics(hass, entry.entry_id).as_dict(),
+    }
+    if cover is not None:
+        diagnostics["cover"] = {
+            "entity_id": cover.entity_id,
+            "attributes": cover.extra_state_attributes,
+            "travel_calc": _calculator_snapshot(cover.travel_calc),
+            "tilt_calc": _calculator_snapshot(cover.tilt_calc),
+        }
+
+    driver = domain_data.get(DATA_RELAY_DRIVER)
+    if driver is not None:
+        diagnostics["relay_driver"] = {
+            "sent": driver.sent,
+            "skipped": driver.skipped,
+            "retries": driver.retries,
+            "failures": driver.failures,
+            "backends": {
+                entity_id: driver.backend(entity_id).name
+                for entity_id in (cover.switch_entity_ids if cover is not None else ())
+            },
+        }
+    router = domain_data.get(DATA_SWITCH_ROUTER)
+    if router is not None:
+        diagnostics["switch_router"] = {"routed": router.routed, "debounced": router.debounced}
+    admission = domain_data.get(DATA_ADMISSION)
+    if admission is not None:
+        diagnostics["admission"] = admission.as_dict()
+    coordinator = domain_data.get(DATA_COORDINATOR)
+    if coordinator is not None:
+        diagnostics["coordinator"] = {"moving": coordinator.moving_count}
+    return diagnostics
@@ -0,0 +1,102 @@
+from bisect import bisect_left
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_METRICS, DOMAIN
+
+SIGNAL_METRICS_UPDATED = f"{DOMAIN}_metrics_updated_{{}}"
+
+# Upper bounds of the histogram buckets, in seconds
+HISTOGRAM_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations, in seconds."""
+
+    __slots__ = ("counts", "count", "total", "max", "last")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of all values."""
+        return self.total / self.count if self.count else None
+
+    def add(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect_left(HISTOGRAM_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self) -> dict:
+        """Return the histogram for diagnostics."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "last": self.last,
+            "buckets": dict(zip([*map(str, HISTOGRAM_BOUNDS), "inf"], self.counts)),
+        }
+
+
+class CoverMetrics:
+    """Counters and histograms of one cover."""
+
+    __slots__ = (
+        "ticks",
+        "state_writes",
+        "relay_commands",
+        "relay_latency",
+        "stop_overshoot",
+        "external_handled",
+        "external_ignored",
+        "motor_runtime",
+        "admission_wait",
+    )
+
+    def __init__(self):
+        """Initialize zeroed metrics."""
+        self.ticks = 0
+        self.state_writes = 0
+        self.relay_commands = 0
+        self.relay_latency = Histogram()
+        # Absolute overshoot, the signed last one is a cover attribute.
+        self.stop_overshoot = Histogram()
+        self.external_handled = 0
+        self.external_ignored = 0
+        self.motor_runtime = 0.0
+        # Time the queued motor starts waited for their admission.
+        self.admission_wait = Histogram()
+
+    def as_dict(self) -> dict:
+        """Return the metrics for diagnostics."""
+        return {
+            "ticks": self.ticks,
+            "state_writes": self.state_writes,
+            "relay_commands": self.relay_commands,
+            "relay_latency": self.relay_latency.as_dict(),
+            "stop_overshoot": self.stop_overshoot.as_dict(),
+            "external_handled": self.external_handled,
+            "external_ignored": self.external_ignored,
+            "motor_runtime": self.motor_runtime,
+            "admission_wait": self.admission_wait.as_dict(),
+        }
+
+
+@callback
+def async_get_metrics(hass: HomeAssistant, entry_id: str) -> CoverMetrics:
+    """Return the metrics of the cover of a config entry."""
+    all_metrics = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_METRICS, {})
+    metrics = all_metrics.get(entry_id)
+    if metrics is None:
+        metrics = all_metrics[entry_id] = CoverMetrics()
+    return metrics
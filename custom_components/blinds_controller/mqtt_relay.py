@@ -0,0 +1,102 @@
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+
+from .backends import SwitchServiceBackend
+from .const import (
+    CONF_COMMAND_TOPIC,
+    CONF_PAYLOAD_OFF,
+    CONF_PAYLOAD_ON,
+    CONF_QOS,
+    CONF_RETAIN,
+    CONF_STATE_OFF,
+    CONF_STATE_ON,
+    CONF_STATE_TOPIC,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MqttRelayBackend(SwitchServiceBackend):
+    """Publish relay commands straight to their MQTT command topics.
+
+    A command is one publish of a preformatted payload, without the service
+    call, its validation and the dispatch to the switch entity. The relay
+    states are read from their state topics, falling back to the switch
+    entities until a state was received. A relay with a state topic is
+    switched once it reported the new state there.
+    """
+
+    name = "mqtt"
+
+    def __init__(self, hass: HomeAssistant, relays: dict):
+        """Initialize the backend for the relays configured, by switch entity ID."""
+        super().__init__(hass)
+        self._relays = relays
+        self._states = {}
+        self._followed = set()
+        # The state awaited by the command in flight, by switch entity ID
+        self._confirmations = {}
+
+    @property
+    def entity_ids(self) -> list[str]:
+        """Return the switches driven through MQTT."""
+        return list(self._relays)
+
+    async def async_start(self) -> None:
+        """Follow the state topics of the relays, once the MQTT client is up."""
+        if not await mqtt.async_wait_for_mqtt_client(self.hass):
+            _LOGGER.error("MQTT is not available, relay states are read from the switch entities")
+            return
+        for entity_id, relay in self._relays.items():
+            if relay.get(CONF_STATE_TOPIC) is None:
+                continue
+
+            @callback
+            def message_received(msg, entity_id=entity_id, relay=relay) -> None:
+                if msg.payload == relay[CONF_STATE_ON]:
+                    state = True
+                elif msg.payload == relay[CONF_STATE_OFF]:
+                    state = False
+                else:
+                    return
+                self._states[entity_id] = state
+                confirmation = self._confirmations.get(entity_id)
+                if confirmation is not None and confirmation[0] == state and not confirmation[1].done():
+                    confirmation[1].set_result(None)
+
+            # The relays are followed for as long as Home Assistant runs.
+            await mqtt.async_subscribe(self.hass, relay[CONF_STATE_TOPIC], message_received, relay[CONF_QOS])
+            self._followed.add(entity_id)
+
+    @callback
+    def state(self, entity_id: str) -> bool | None:
+        """Return if the relay is on, as last reported on its state topic."""
+        state = self._states.get(entity_id)
+        return super().state(entity_id) if state is None else state
+
+    async def async_set(self, entity_id: str, on: bool) -> None:
+        """Publish the command, returning once the relay reported the new state.
+
+        Without a followed state topic, return once the client handed the
+        command over. The driver bounds the wait by the command timeout.
+        """
+        relay = self._relays[entity_id]
+        confirmation = None
+        if entity_id in self._followed:
+            # Set up before the publish, the state may come back before it returns.
+            confirmation = self._confirmations[entity_id] = (on, self.hass.loop.create_future())
+        try:
+            await mqtt.async_publish(
+                self.hass,
+                relay[CONF_COMMAND_TOPIC],
+                relay[CONF_PAYLOAD_ON] if on else relay[CONF_PAYLOAD_OFF],
+                relay[CONF_QOS],
+                relay[CONF_RETAIN],
+            )
+            if confirmation is not None:
+                await confirmation[1]
+        finally:
+            if self._confirmations.get(entity_id) is confirmation:
+                del self._confirmations[entity_id]
@@ -0,0 +1,49 @@
+from typing import NamedTuple
+
+from homeassistant.const import SERVICE_CLOSE_COVER, SERVICE_OPEN_COVER
+
+
+class MotionPhase(NamedTuple):
+    """One run of the motor in a single direction."""
+
+    command: str
+    # Targets reached at the end of the run, None for a value left alone
+    position: int | None
+    tilt: int | None
+    # Seconds the travel waits while the slats turn at the start of the run
+    offset: float
+
+
+def plan_motion(
+    position: int,
+    target_position: int | None,
+    tilt: int | None,
+    target_tilt: int | None,
+    tilt_time_open: float,
+    tilt_time_closed: float,
+) -> list[MotionPhase]:
+    """Plan the runs of one motor moving a blind to a position and tilt.
+
+    A run first turns the slats all the way in its direction and only then
+    moves the blind, so a travel ends with the slats fully open or closed. A
+    tilt other than that is reached by reversing for a short second run.
+    `tilt` is None for a blind without tilt.
+    """
+    phases = []
+    if target_position is not None and target_position != position:
+        opening = target_position > position
+        end_tilt = None
+        offset = 0.0
+        if tilt is not None:
+            end_tilt = 100 if opening else 0
+            offset = (tilt_time_open if opening else tilt_time_closed) * abs(end_tilt - tilt) / 100
+            tilt = end_tilt
+        phases.append(
+            MotionPhase(SERVICE_OPEN_COVER if opening else SERVICE_CLOSE_COVER, target_position, end_tilt, offset)
+        )
+
+    if tilt is not None and target_tilt is not None and target_tilt != tilt:
+        phases.append(
+            MotionPhase(SERVICE_OPEN_COVER if target_tilt > tilt else SERVICE_CLOSE_COVER, None, target_tilt, 0.0)
+        )
+    return phases
@@ -0,0 +1,54 @@
+from .const import CALIBRATION_MIN_SAMPLES, CALIBRATION_SMOOTHING, CALIBRATION_TOLERANCE
+
+MOTOR_START = "start"
+MOTOR_STOP = "stop"
+
+
+class MotorEdgeDetector:
+    """Detect motor start and stop edges in a power reading stream.
+
+    The motor counts as running above `threshold` and as stopped below half
+    of it, so readings hovering around the threshold do not toggle it.
+    """
+
+    __slots__ = ("threshold", "running")
+
+    def __init__(self, threshold: float):
+        """Initialize the detector."""
+        self.threshold = threshold
+        self.running = False
+
+    def feed(self, power: float) -> str | None:
+        """Feed a power reading, in W. Return the edge it completes, if any."""
+        if self.running:
+            if power < self.threshold / 2:
+                self.running = False
+                return MOTOR_STOP
+        elif power > self.threshold:
+            self.running = True
+            return MOTOR_START
+        return None
+
+
+class TravelTimeEstimator:
+    """Exponentially weighted travel time, rejecting runs far off the estimate."""
+
+    __slots__ = ("estimate", "samples", "rejected")
+
+    def __init__(self, initial: float):
+        """Initialize the estimator with the configured travel time."""
+        self.estimate = initial
+        self.samples = 0
+        self.rejected = 0
+
+    def add(self, travel_time: float) -> bool:
+        """Feed a measured full travel time. Return if it was accepted."""
+        if (
+            self.samples >= CALIBRATION_MIN_SAMPLES
+            and abs(travel_time - self.estimate) > CALIBRATION_TOLERANCE * self.estimate
+        ):
+            self.rejected += 1
+            return False
+        self.samples += 1
+        self.estimate += CALIBRATION_SMOOTHING * (travel_time - self.estimate)
+        return True
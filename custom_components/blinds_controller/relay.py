@@ -0,0 +1,211 @@
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .backends import SwitchServiceBackend
+from .const import (
+    DATA_RELAY_DRIVER,
+    DEFAULT_COMMAND_RETRIES,
+    DEFAULT_COMMAND_TIMEOUT,
+    DOMAIN,
+    LATENCY_OUTLIER_FACTOR,
+    LATENCY_SMOOTHING,
+    RETRY_BACKOFF,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Samples needed before round-trips are checked for outliers
+_OUTLIER_MIN_SAMPLES = 5
+
+
+class RelayCommandError(HomeAssistantError):
+    """A relay did not confirm a command within its deadline and retries."""
+
+
+class LatencyEstimator:
+    """Rolling estimate of the command round-trip of a relay."""
+
+    def __init__(self, smoothing: float = LATENCY_SMOOTHING):
+        """Initialize the estimator."""
+        self._smoothing = smoothing
+        self.estimate = 0.0
+        self.last = None
+        self.samples = 0
+        self.outliers = 0
+
+    def add(self, latency: float) -> bool:
+        """Feed a measured round-trip, in seconds. Return if it is an outlier."""
+        self.last = latency
+        self.samples += 1
+        if self.samples == 1:
+            self.estimate = latency
+            return False
+
+        ceiling = LATENCY_OUTLIER_FACTOR * self.estimate
+        outlier = self.samples > _OUTLIER_MIN_SAMPLES and latency > ceiling
+        if outlier:
+            # Let a single stall pull the estimate up only so far.
+            self.outliers += 1
+            latency = ceiling
+        self.estimate += self._smoothing * (latency - self.estimate)
+        return outlier
+
+
+class RelayDriver:
+    """Drive the switches of all covers of the domain.
+
+    Commands are serialized per relay and skipped when both the last commanded
+    and the observed state already match. A relay shared by several covers,
+    e.g. a group master, stays on until the last cover holding it releases it.
+    Relays are switched through the switch services, unless a backend was set
+    for them.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the driver."""
+        self.hass = hass
+        self.default_backend = SwitchServiceBackend(hass)
+        self._backends = {}
+        self._commanded = {}
+        self._locks = {}
+        self._holders = {}
+        self._latency = {}
+        self.sent = 0
+        self.skipped = 0
+        self.retries = 0
+        self.failures = 0
+
+    @callback
+    def latency(self, entity_id: str) -> LatencyEstimator:
+        """Return the latency estimator of a relay."""
+        estimator = self._latency.get(entity_id)
+        if estimator is None:
+            estimator = self._latency[entity_id] = LatencyEstimator()
+        return estimator
+
+    @callback
+    def backend(self, entity_id: str):
+        """Return the backend switching a relay."""
+        return self._backends.get(entity_id, self.default_backend)
+
+    @callback
+    def async_set_backend(self, backend, entity_ids) -> None:
+        """Switch the relays `entity_ids` through `backend`."""
+        for entity_id in entity_ids:
+            self._backends[entity_id] = backend
+
+    @callback
+    def holders(self, entity_id: str) -> set:
+        """Return the owners currently holding a relay on."""
+        return self._holders.get(entity_id, set())
+
+    async def async_turn_on(self, entity_id: str, owner: str, **kwargs) -> bool:
+        """Turn a relay on for `owner`. Return whether a command was sent."""
+        self._holders.setdefault(entity_id, set()).add(owner)
+        return await self._async_set(entity_id, True, **kwargs)
+
+    async def async_turn_off(self, entity_id: str, owner: str, **kwargs) -> bool:
+        """Release a relay held by `owner`, turning it off once nobody holds it.
+
+        Return whether a command was sent.
+        """
+        holders = self._holders.get(entity_id)
+        if holders:
+            holders.discard(owner)
+            if holders:
+                _LOGGER.debug("Keeping %s on, still held by %s", entity_id, ", ".join(sorted(holders)))
+                return False
+        return await self._async_set(entity_id, False, **kwargs)
+
+    @callback
+    def async_follow(self, owner: str, on: tuple = (), off: tuple = ()) -> bool:
+        """Take over relays switched from outside for `owner`, if they need no command.
+
+        The relays in `on` are held for `owner` and those in `off` released, as
+        if commanded. Return False, changing nothing, when a relay is not seen
+        in the requested state or has a command in flight.
+        """
+        relays = [(entity_id, True) for entity_id in on] + [(entity_id, False) for entity_id in off]
+        for entity_id, requested in relays:
+            lock = self._locks.get(entity_id)
+            if (lock is not None and lock.locked()) or self.backend(entity_id).state(entity_id) is not requested:
+                return False
+
+        for entity_id, requested in relays:
+            if requested:
+                self._holders.setdefault(entity_id, set()).add(owner)
+            elif entity_id in self._holders:
+                self._holders[entity_id].discard(owner)
+            self._commanded[entity_id] = requested
+        self.skipped += len(relays)
+        return True
+
+    @callback
+    def _is_redundant(self, entity_id: str, on: bool) -> bool:
+        """Return if the relay is known to be in the requested state already."""
+        commanded = self._commanded.get(entity_id)
+        if commanded is not None and commanded != on:
+            return False
+        return self.backend(entity_id).state(entity_id) is on
+
+    async def _async_set(
+        self,
+        entity_id: str,
+        on: bool,
+        timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        retries: int = DEFAULT_COMMAND_RETRIES,
+    ) -> bool:
+        lock = self._locks.get(entity_id)
+        if lock is None:
+            lock = self._locks[entity_id] = asyncio.Lock()
+
+        async with lock:
+            if self._is_redundant(entity_id, on):
+                self.skipped += 1
+                return False
+
+            # Until the call returns the relay may be in either state.
+            self._commanded.pop(entity_id, None)
+            service = "turn_on" if on else "turn_off"
+            backend = self.backend(entity_id)
+            loop = self.hass.loop
+            for attempt in range(retries + 1):
+                if attempt:
+                    self.retries += 1
+                    await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+                started = loop.time()
+                try:
+                    async with asyncio.timeout(timeout):
+                        await backend.async_set(entity_id, on)
+                except (TimeoutError, HomeAssistantError) as err:
+                    _LOGGER.debug(
+                        "%s of %s failed (attempt %s of %s): %s",
+                        service, entity_id, attempt + 1, retries + 1, str(err) or "timed out",
+                    )
+                    error = err
+                    continue
+
+                latency = loop.time() - started
+                if self.latency(entity_id).add(latency):
+                    _LOGGER.warning("%s of %s took %.3f s", service, entity_id, latency)
+                self._commanded[entity_id] = on
+                self.sent += 1
+                return True
+
+            self.failures += 1
+            raise RelayCommandError(
+                f"{service} of {entity_id} failed after {retries + 1} attempts: {str(error) or 'timed out'}"
+            )
+
+
+@callback
+def async_get_relay_driver(hass: HomeAssistant) -> RelayDriver:
+    """Return the relay driver shared by all covers of the domain."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    driver = domain_data.get(DATA_RELAY_DRIVER)
+    if driver is None:
+        driver = domain_data[DATA_RELAY_DRIVER] = RelayDriver(hass)
+    return driver
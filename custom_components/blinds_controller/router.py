@@ -0,0 +1,113 @@
+import logging
+from asyncio import TimerHandle
+
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DATA_SWITCH_ROUTER, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SwitchEventRouter:
+    """Route the state changes of the relays to the covers wired to them.
+
+    There is one listener per switch, however many covers it drives. Changes
+    of a switch within the debounce window of its covers are coalesced: only
+    the state the switch settles in is routed, and a flap back to the state
+    it had before is dropped. Covers handle a change in a callback and create
+    a task only when relays have to be commanded.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the router."""
+        self.hass = hass
+        self._covers = {}
+        self._switches = {}
+        self._unsubscribe = {}
+        self._pending: dict[str, tuple[TimerHandle, str | None]] = {}
+        self.routed = 0
+        self.debounced = 0
+
+    @callback
+    def async_add(self, cover, entity_ids) -> None:
+        """Route the changes of `entity_ids` to `cover`, instead of any switches before."""
+        self.async_remove(cover)
+        self._switches[cover] = tuple(entity_ids)
+        for entity_id in entity_ids:
+            covers = self._covers.get(entity_id)
+            if covers is None:
+                covers = self._covers[entity_id] = set()
+                self._unsubscribe[entity_id] = async_track_state_change_event(
+                    self.hass, [entity_id], self._async_state_changed
+                )
+            covers.add(cover)
+
+    @callback
+    def async_remove(self, cover) -> None:
+        """Stop routing any switch to `cover`."""
+        for entity_id in self._switches.pop(cover, ()):
+            covers = self._covers.get(entity_id)
+            if covers is None:
+                continue
+            covers.discard(cover)
+            if covers:
+                continue
+            del self._covers[entity_id]
+            self._unsubscribe.pop(entity_id)()
+            pending = self._pending.pop(entity_id, None)
+            if pending is not None:
+                pending[0].cancel()
+
+    def _window(self, entity_id: str) -> float:
+        """Return the debounce window of a switch, the longest of its covers."""
+        return max((cover.switch_debounce for cover in self._covers.get(entity_id, ())), default=0.0)
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Route a change at once, or wait for the switch to settle."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        window = self._window(entity_id)
+        pending = self._pending.get(entity_id)
+        if not window and pending is None:
+            if new_state is not None:
+                self._async_route(entity_id, new_state)
+            return
+
+        if pending is None:
+            old_state = event.data.get("old_state")
+            before = None if old_state is None else old_state.state
+        else:
+            handle, before = pending
+            handle.cancel()
+            self.debounced += 1
+        handle = self.hass.loop.call_later(window, self._async_settled, entity_id, before)
+        self._pending[entity_id] = (handle, before)
+
+    @callback
+    def _async_settled(self, entity_id: str, before: str | None) -> None:
+        """Route the state a switch settled in, unless it flapped back."""
+        del self._pending[entity_id]
+        state = self.hass.states.get(entity_id)
+        if state is None or state.state == before:
+            _LOGGER.debug("Dropping a flap of %s back to %s", entity_id, before)
+            self.debounced += 1
+            return
+        self._async_route(entity_id, state)
+
+    @callback
+    def _async_route(self, entity_id: str, new_state: State) -> None:
+        self.routed += 1
+        for cover in list(self._covers.get(entity_id, ())):
+            cover.async_switch_changed(entity_id, new_state)
+
+
+@callback
+def async_get_switch_router(hass: HomeAssistant) -> SwitchEventRouter:
+    """Return the switch event router shared by all covers of the domain."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    router = domain_data.get(DATA_SWITCH_ROUTER)
+    if router is None:
+        router = domain_data[DATA_SWITCH_ROUTER] = SwitchEventRouter(hass)
+    return router
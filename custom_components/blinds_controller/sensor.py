@@ -0,0 +1,108 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN
+from .metrics import SIGNAL_METRICS_UPDATED, CoverMetrics, async_get_metrics
+
+
+def _milliseconds(value: float | None) -> float | None:
+    return None if value is None else round(value * 1000, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor showing one metric of a cover."""
+
+    value_fn: Callable[[CoverMetrics], float | int | None]
+
+
+SENSORS = (
+    MetricSensorEntityDescription(
+        key="relay_commands",
+        name="Relay commands",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.relay_commands,
+    ),
+    MetricSensorEntityDescription(
+        key="relay_latency",
+        name="Relay latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _milliseconds(metrics.relay_latency.mean),
+    ),
+    MetricSensorEntityDescription(
+        key="stop_overshoot",
+        name="Stop overshoot",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _milliseconds(metrics.stop_overshoot.last),
+    ),
+    MetricSensorEntityDescription(
+        key="motor_runtime",
+        name="Motor runtime",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: round(metrics.motor_runtime, 1),
+    ),
+    MetricSensorEntityDescription(
+        key="state_writes",
+        name="State writes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.state_writes,
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Set up the metric sensors of a blind, if enabled."""
+    if not entry.options.get("metrics_sensors", entry.data.get("metrics_sensors", False)):
+        return
+    metrics = async_get_metrics(hass, entry.entry_id)
+    async_add_entities(MetricSensor(entry, metrics, description) for description in SENSORS)
+
+
+class MetricSensor(SensorEntity):
+    """Sensor showing one metric of a blind, refreshed after each relay command."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    entity_description: MetricSensorEntityDescription
+
+    def __init__(self, entry: ConfigEntry, metrics: CoverMetrics, description: MetricSensorEntityDescription):
+        """Initialize the sensor."""
+        self.entity_description = description
+        self.entry = entry
+        self._metrics = metrics
+        self._attr_unique_id = f"cover_timebased_synced_uuid_{entry.entry_id}_{description.key}"
+        # Same device as the cover.
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, entry.entry_id)})
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric."""
+        return self.entity_description.value_fn(self._metrics)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the updates of the metrics."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_METRICS_UPDATED.format(self.entry.entry_id), self.async_write_ha_state
+            )
+        )
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from .calculator import clock
+from .const import DATA_COVERS, DEFAULT_MAX_CONCURRENCY, DOMAIN
+from .relay import RelayCommandError
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_KNOWN_POSITION = "set_known_position"
+SERVICE_SET_KNOWN_TILT_POSITION = "set_known_tilt_position"
+SERVICE_SET_POSITIONS = "set_positions"
+SERVICE_RECORD_CALIBRATION_POINT = "record_calibration_point"
+SERVICE_SET_POSITION_AND_TILT = "set_position_and_tilt"
+SERVICE_MOVE_TO_POSITION = "move_to_position"
+
+SET_KNOWN_POSITION_SCHEMA = cv.make_entity_service_schema(
+    {vol.Required("position"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100))}
+)
+
+RECORD_CALIBRATION_POINT_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required("position"): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional("time"): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+        vol.Optional("clear", default=False): cv.boolean,
+    }
+)
+
+SET_POSITION_AND_TILT_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Optional("position"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+            vol.Optional("tilt_position"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        }
+    ),
+    cv.has_at_least_one_key("position", "tilt_position"),
+)
+
+MOVE_TO_POSITION_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required("position"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("wait", default=False): cv.boolean,
+    }
+)
+
+SET_POSITIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required("positions"): vol.Schema(
+            {cv.entity_id: vol.All(vol.Coerce(int), vol.Range(min=0, max=100))}
+        ),
+        vol.Optional("max_concurrency", default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+def _get_covers(hass: HomeAssistant, entity_ids) -> dict:
+    """Return the covers of the domain for `entity_ids`, all of them must exist."""
+    covers = hass.data.get(DOMAIN, {}).get(DATA_COVERS, {})
+    unknown = [entity_id for entity_id in entity_ids if entity_id not in covers]
+    if unknown:
+        raise HomeAssistantError(f"Not a {DOMAIN} cover: {', '.join(unknown)}")
+    return {entity_id: covers[entity_id] for entity_id in entity_ids}
+
+
+async def _async_get_targeted_covers(hass: HomeAssistant, call: ServiceCall) -> list:
+    """Return the covers of the domain among the targets of `call`."""
+    covers = hass.data.get(DOMAIN, {}).get(DATA_COVERS, {})
+    return [
+        covers[entity_id]
+        for entity_id in await async_extract_entity_ids(hass, call)
+        if entity_id in covers
+    ]
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain services."""
+
+    async def async_set_known_position(call: ServiceCall) -> None:
+        """Set the known position of covers without moving them."""
+        for cover in await _async_get_targeted_covers(hass, call):
+            await cover.async_set_known_position(call.data["position"])
+
+    async def async_set_known_tilt_position(call: ServiceCall) -> None:
+        """Set the known tilt position of covers without moving them."""
+        for cover in await _async_get_targeted_covers(hass, call):
+            await cover.async_set_known_tilt_position(call.data["position"])
+
+    async def async_record_calibration_point(call: ServiceCall) -> None:
+        """Add a point to the travel calibration of covers."""
+        for cover in await _async_get_targeted_covers(hass, call):
+            await cover.async_record_calibration_point(
+                call.data["position"], call.data.get("time"), call.data["clear"]
+            )
+
+    async def async_set_position_and_tilt(call: ServiceCall) -> None:
+        """Move covers to a position and tilt, each in one planned relay sequence."""
+        await asyncio.gather(
+            *(
+                cover.async_set_position_and_tilt(call.data.get("position"), call.data.get("tilt_position"))
+                for cover in await _async_get_targeted_covers(hass, call)
+            )
+        )
+
+    async def async_move_to_position(call: ServiceCall) -> ServiceResponse:
+        """Move covers to a position and respond with their arrival, or once they arrived."""
+        covers = await _async_get_targeted_covers(hass, call)
+        results = await asyncio.gather(
+            *(cover.async_move_to_position(call.data["position"], call.data["wait"]) for cover in covers)
+        )
+        return {cover.entity_id: result for cover, result in zip(covers, results)}
+
+    async def async_set_positions(call: ServiceCall) -> None:
+        """Move many covers at once, with a bounded number of relay commands in flight."""
+        positions = call.data["positions"]
+        covers = _get_covers(hass, positions)
+
+        # All moves share one start time, the relays follow as fast as allowed.
+        now = clock()
+        moves = [
+            (cover, command)
+            for entity_id, cover in covers.items()
+            if (command := cover.start_move(positions[entity_id], now))
+        ]
+
+        semaphore = asyncio.Semaphore(call.data["max_concurrency"])
+
+        async def async_send(cover, command):
+            async with semaphore:
+                await cover.async_send_move(command)
+
+        _LOGGER.debug("Moving %d covers, %d at a time", len(moves), call.data["max_concurrency"])
+        results = await asyncio.gather(
+            *(async_send(cover, command) for cover, command in moves), return_exceptions=True
+        )
+        failed = []
+        for (cover, _), result in zip(moves, results):
+            if isinstance(result, RelayCommandError):
+                failed.append(cover.entity_id)
+            elif isinstance(result, BaseException):
+                raise result
+        if failed:
+            raise HomeAssistantError(f"Relays did not respond for {', '.join(failed)}")
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_KNOWN_POSITION, async_set_known_position, schema=SET_KNOWN_POSITION_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_KNOWN_TILT_POSITION, async_set_known_tilt_position, schema=SET_KNOWN_POSITION_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_POSITIONS, async_set_positions, schema=SET_POSITIONS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_POSITION_AND_TILT,
+        async_set_position_and_tilt,
+        schema=SET_POSITION_AND_TILT_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MOVE_TO_POSITION,
+        async_move_to_position,
+        schema=MOVE_TO_POSITION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_CALIBRATION_POINT,
+        async_record_calibration_point,
+        schema=RECORD_CALIBRATION_POINT_SCHEMA,
+    )
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .calculator import PositionType, TravelCalculator, TravelStatus, clock
+from .const import DATA_MOTION_STORE, DOMAIN, MOTION_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.motion"
+
+
+def calc_to_record(calc: TravelCalculator) -> dict:
+    """Return the persistent state of a calculator, its start on the wall clock."""
+    started = None
+    if calc.travel_direction is not TravelStatus.STOPPED:
+        started = time.time() - (clock() - calc.travel_started_time)
+    return {
+        "position": calc.last_known_position,
+        "target": calc.travel_to_position,
+        "direction": calc.travel_direction.name,
+        "type": calc.position_type.name,
+        "started": started,
+    }
+
+
+def restore_calc(calc: TravelCalculator, record: dict, resume: bool) -> bool:
+    """Restore a calculator from its record. Return if it is traveling again.
+
+    A travel that was in progress is resumed where it would be now if
+    `resume`, i.e. its relay is still on. Otherwise the motor stopped at an
+    unknown instant and the position is kept only as a guess.
+    """
+    calc.set_position(record["position"])
+    calc.position_type = PositionType[record["type"]]
+    if TravelStatus[record["direction"]] is TravelStatus.STOPPED:
+        return False
+
+    if resume:
+        calc.start_travel(record["target"], clock() - (time.time() - record["started"]))
+        return True
+
+    calc.position_type = PositionType.UNKNOWN
+    return False
+
+
+class MotionStore:
+    """Write-behind store of the travel state of all covers of the domain.
+
+    Changes only mark the data dirty, one delayed save writes all of them, so
+    any number of covers starting at once costs a single disk write.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the store."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._records = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load all records, once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load()
+            self._records = (data or {}).get("covers", {})
+            self._loaded = True
+
+    async def async_get(self, key: str) -> dict | None:
+        """Return the record of a cover."""
+        await self.async_load()
+        return self._records.get(key)
+
+    @callback
+    def async_set(self, key: str, record: dict) -> None:
+        """Store the record of a cover with the next delayed save."""
+        self._records[key] = record
+        self._store.async_delay_save(self._data_to_save, MOTION_SAVE_DELAY)
+
+    async def async_remove(self, key: str) -> None:
+        """Drop the record of a cover."""
+        await self.async_load()
+        if self._records.pop(key, None) is not None:
+            self._store.async_delay_save(self._data_to_save, MOTION_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {"covers": self._records}
+
+
+@callback
+def async_get_motion_store(hass: HomeAssistant) -> MotionStore:
+    """Return the motion store shared by all covers of the domain."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get(DATA_MOTION_STORE)
+    if store is None:
+        store = domain_data[DATA_MOTION_STORE] = MotionStore(hass)
+    return store
@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.blinds_controller.admission import MotorAdmission
+
+
+def _admission(max_running=None, circuits=None) -> MotorAdmission:
+    # The controller only needs the event loop of Home Assistant.
+    return MotorAdmission(SimpleNamespace(loop=asyncio.get_running_loop()), max_running, circuits)
+
+
+def test_unlimited():
+    """Without limits every motor starts at once."""
+
+    async def run():
+        admission = _admission()
+        assert all(admission.try_acquire(owner) for owner in "abc")
+        assert await admission.async_acquire("d") == 0.0
+        assert admission.running == 4
+
+    asyncio.run(run())
+
+
+def test_global_limit_serves_priority_then_arrival():
+    """Queued motors start by priority, then in the order they queued."""
+
+    async def run():
+        admission = _admission(max_running=1)
+        assert admission.try_acquire("a")
+        assert not admission.try_acquire("b")
+        admitted = []
+
+        async def acquire(owner, priority):
+            await admission.async_acquire(owner, priority=priority)
+            admitted.append(owner)
+
+        tasks = [asyncio.create_task(acquire(owner, priority)) for owner, priority in (("b", 0), ("c", 0), ("d", 1))]
+        await asyncio.sleep(0)
+        assert admission.queue_depth == 3
+        for owner in ("a", "d", "b"):
+            admission.release(owner)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert admitted == ["d", "b", "c"]
+        assert admission.queued == 3
+        assert admission.max_queue_depth == 3
+
+    asyncio.run(run())
+
+
+def test_circuit_limit_does_not_hold_back_other_circuits():
+    """A motor blocked by its own circuit lets motors on other circuits start."""
+
+    async def run():
+        admission = _admission(circuits={"a": 1})
+        assert admission.try_acquire("a1", "a")
+        queued = asyncio.create_task(admission.async_acquire("a2", "a"))
+        await asyncio.sleep(0)
+        assert admission.try_acquire("b1", "b")
+        assert admission.try_acquire("none")
+        assert not queued.done()
+        admission.release("a1")
+        await queued
+        assert admission.is_admitted("a2")
+
+    asyncio.run(run())
+
+
+def test_cancelled_wait_leaves_the_queue():
+    """A superseded command gives up its place in the queue."""
+
+    async def run():
+        admission = _admission(max_running=1)
+        admission.try_acquire("a")
+        queued = asyncio.create_task(admission.async_acquire("b"))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert admission.queue_depth == 0
+        admission.release("a")
+        assert admission.running == 0
+        assert admission.try_acquire("c")
+
+    asyncio.run(run())
+
+
+def test_claim_counts_a_motor_over_the_limit():
+    """A motor started outside the admission holds a slot until it stops."""
+
+    async def run():
+        admission = _admission(max_running=1)
+        admission.try_acquire("a")
+        admission.claim("b")
+        assert admission.running == 2
+        assert admission.is_admitted("b")
+        admission.release("a")
+        assert not admission.try_acquire("c")
+        admission.release("b")
+        assert admission.try_acquire("c")
+
+    asyncio.run(run())
+
+
+def test_configure_admits_queued():
+    """Raising a limit starts the motors it now allows."""
+
+    async def run():
+        admission = _admission(max_running=1)
+        admission.try_acquire("a")
+        queued = asyncio.create_task(admission.async_acquire("b"))
+        await asyncio.sleep(0)
+        admission.configure(2, {})
+        await queued
+        assert admission.running == 2
+
+    asyncio.run(run())
@@ -0,0 +1,150 @@
+import pytest
+
+from custom_components.blinds_controller.calculator import TravelCalculator, TravelCurve, TravelStatus
+
+# Samples on either side of a computed change, far below one position step
+EPSILON = 1e-6
+
+
+def _calculator(travel_time=10.0, startup_delay=0.0, curve=None, position=0, now=100.0) -> TravelCalculator:
+    calc = TravelCalculator(travel_time, travel_time, startup_delay, curve)
+    calc.set_position(position)
+    calc.time_set_from_outside = now
+    return calc
+
+
+def _share(curve: TravelCurve | None, start: int, target: int) -> float:
+    if curve is None:
+        return abs(target - start) / 100
+    return abs(curve.time_at(target) - curve.time_at(start))
+
+
+def _position_at(calc: TravelCalculator, now: float) -> int:
+    calc.time_set_from_outside = now
+    return calc.current_position()
+
+
+def test_retarget_keeps_remaining_startup():
+    """A retarget during the startup delay does not start the delay again."""
+    calc = _calculator(startup_delay=1.0)
+    calc.start_travel(100)
+    calc.time_set_from_outside = 100.5
+    calc.retarget(50)
+    assert _position_at(calc, 101.0) == 0
+    assert _position_at(calc, 103.0) == 20
+    assert _position_at(calc, 106.0) == 50
+    assert calc.travel_direction is TravelStatus.DIRECTION_UP
+
+
+def test_retarget_while_moving_skips_startup():
+    """A retarget of a moving cover goes on from where it stands."""
+    calc = _calculator(startup_delay=1.0)
+    calc.start_travel(100)
+    calc.retarget(80, now=103.0)
+    assert _position_at(calc, 103.0) == 20
+    assert _position_at(calc, 104.0) == 30
+    assert _position_at(calc, 109.0) == 80
+    assert calc.time_to_target() == 0.0
+
+
+def test_set_travel_times_keeps_position_and_travel():
+    """New travel times apply from the current position on."""
+    calc = _calculator(startup_delay=1.0)
+    calc.start_travel(100)
+    calc.time_set_from_outside = 103.0
+    calc.set_travel_times(20.0, 20.0, 1.0)
+    assert calc.current_position() == 20
+    assert _position_at(calc, 105.0) == 30
+    assert calc.time_to_target() == pytest.approx(14.0)
+
+
+def test_set_travel_times_keeps_remaining_startup():
+    """New travel times during the startup delay keep the motor start."""
+    calc = _calculator(startup_delay=1.0)
+    calc.start_travel(100)
+    calc.time_set_from_outside = 100.4
+    calc.set_travel_times(20.0, 20.0, 1.0)
+    assert _position_at(calc, 101.0) == 0
+    assert _position_at(calc, 103.0) == 10
+
+
+def test_set_travel_times_when_stopped():
+    """New travel times of a stopped cover only change its next travel."""
+    calc = _calculator(position=40)
+    calc.set_travel_times(20.0, 20.0, 0.0)
+    assert calc.current_position() == 40
+    calc.start_travel(50)
+    assert calc.time_to_target() == pytest.approx(2.0)
+
+
+def test_curve_round_trip():
+    """Positions and time shares of a curve map onto each other."""
+    curve = TravelCurve([(50, 4.0), (90, 9.0)], 10.0)
+    assert curve.time_at(0) == 0.0
+    assert curve.time_at(50) == pytest.approx(0.4)
+    assert curve.time_at(100) == 1.0
+    for position in (0, 10, 25, 50, 70, 90, 95, 100):
+        assert curve.position_at(curve.time_at(position)) == pytest.approx(position)
+
+
+def test_curve_full_time_point():
+    """A point at fully open replaces the full travel time."""
+    curve = TravelCurve([(50, 6.0), (100, 12.0)], 10.0)
+    assert curve.time_at(50) == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize(
+    "points",
+    [[(50, 4.0), (60, 3.0)], [(50, 10.0)], [(101, 5.0)], [(-1, 5.0)]],
+)
+def test_curve_rejects_invalid_points(points):
+    """Times not increasing with the position, or positions out of range, are rejected."""
+    with pytest.raises(ValueError):
+        TravelCurve(points, 10.0)
+
+
+def test_curve_travel_time():
+    """A travel on a curve takes its share of the full travel time."""
+    calc = _calculator(curve=TravelCurve([(50, 4.0)], 10.0))
+    calc.start_travel(50)
+    assert calc.time_to_target() == pytest.approx(4.0)
+    assert _position_at(calc, 102.0) == 25
+    assert _position_at(calc, 107.0) == 50
+
+
+@pytest.mark.parametrize("step", [1, 5])
+@pytest.mark.parametrize(
+    ("start", "target", "startup_delay", "curve"),
+    [
+        (0, 100, 0.0, None),
+        (100, 0, 0.5, None),
+        (13, 87, 0.0, None),
+        (0, 100, 0.0, TravelCurve([(30, 5.0), (80, 8.0)], 12.0)),
+        (95, 5, 0.3, TravelCurve([(30, 5.0), (80, 8.0)], 12.0)),
+    ],
+)
+def test_next_change_matches_position(start, target, startup_delay, curve, step):
+    """The position changes by `step` at the time announced, and not before."""
+    calc = _calculator(travel_time=12.0, startup_delay=startup_delay, curve=curve, position=start)
+    calc.start_travel(target)
+    now = 100.0
+    position = start
+    changes = 0
+    while position != target:
+        calc.time_set_from_outside = now
+        delay = calc.time_to_next_change(step)
+        assert delay > 0
+        change = now + delay
+        before = _position_at(calc, change - EPSILON)
+        after = _position_at(calc, change + EPSILON)
+        if after == target:
+            # The last change is announced at the arrival, where the travel ends.
+            assert change == pytest.approx(100.0 + startup_delay + 12.0 * _share(curve, start, target))
+        else:
+            assert abs(before - position) < step
+            assert abs(after - position) >= step
+        position, now = after, change + EPSILON
+        changes += 1
+    assert changes <= abs(target - start) // step + 1
+    calc.time_set_from_outside = now
+    assert calc.time_to_next_change(step) == 0.0
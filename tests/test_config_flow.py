@@ -0,0 +1,63 @@
+import pytest
+import voluptuous as vol
+
+from custom_components.blinds_controller.config_flow import parse_blinds
+
+
+def test_csv():
+    """A CSV table with a header row gives one blind per row, empty cells take the defaults."""
+    blinds = parse_blinds(
+        "name,entity_up,entity_down,time_up,time_down,tilt_open,tilt_closed\n"
+        "Kitchen,switch.kitchen_up,switch.kitchen_down,25,24,,\n"
+        "Living Room,switch.living_room_up,switch.living_room_down,30,28,1.5,1.5\n"
+    )
+    assert [blind["ent_name"] for blind in blinds] == ["Kitchen", "Living Room"]
+    assert blinds[0]["time_up"] == 25.0
+    assert blinds[0]["tilt_open"] == 0.0
+    assert blinds[1]["tilt_closed"] == 1.5
+    assert blinds[1]["send_stop_at_end"] is True
+
+
+def test_yaml_list_and_mapping():
+    """A YAML list of blinds and a mapping of names to blinds give the same blinds."""
+    listed = parse_blinds(
+        "- name: Kitchen\n  entity_up: switch.kitchen_up\n  entity_down: switch.kitchen_down\n"
+        "  time_up: 25\n  time_down: 24\n  circuit: ground_floor\n"
+    )
+    mapped = parse_blinds(
+        "Kitchen:\n  entity_up: switch.kitchen_up\n  entity_down: switch.kitchen_down\n"
+        "  time_up: 25\n  time_down: 24\n  circuit: ground_floor\n"
+    )
+    assert listed == mapped
+    assert listed[0]["circuit"] == "ground_floor"
+
+
+def test_invalid_rows_are_all_named():
+    """Every invalid row is reported, not only the first."""
+    with pytest.raises(vol.Invalid) as err:
+        parse_blinds(
+            "name,entity_up,entity_down,time_up,time_down\n"
+            "Kitchen,light.kitchen_up,switch.kitchen_down,25,24\n"
+            "Hall,switch.hall_up,switch.hall_down,25,24\n"
+            "Office,switch.office_up,switch.office_down,-1,24\n"
+        )
+    assert "row 1" in str(err.value)
+    assert "row 2" not in str(err.value)
+    assert "row 3" in str(err.value)
+
+
+def test_repeated_relays():
+    """A pair of relays listed twice is reported."""
+    with pytest.raises(vol.Invalid, match="row 2: switch.kitchen_up and switch.kitchen_down are listed twice"):
+        parse_blinds(
+            "name,entity_up,entity_down,time_up,time_down\n"
+            "Kitchen,switch.kitchen_up,switch.kitchen_down,25,24\n"
+            "Kitchen again,switch.kitchen_up,switch.kitchen_down,25,24\n"
+        )
+
+
+@pytest.mark.parametrize("text", ["", "name,entity_up,entity_down,time_up,time_down\n", "[]"])
+def test_no_blinds(text):
+    """A table without blinds is rejected."""
+    with pytest.raises(vol.Invalid, match="no blinds found"):
+        parse_blinds(text)
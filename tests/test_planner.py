@@ -0,0 +1,39 @@
+from homeassistant.const import SERVICE_CLOSE_COVER, SERVICE_OPEN_COVER
+import pytest
+
+from custom_components.blinds_controller.planner import MotionPhase, plan_motion
+
+
+def test_travel_without_tilt():
+    """A blind without tilt moves in one run."""
+    assert plan_motion(20, 80, None, 50, 1.0, 1.0) == [MotionPhase(SERVICE_OPEN_COVER, 80, None, 0.0)]
+
+
+def test_travel_turns_the_slats_first():
+    """The travel waits while the slats turn to the end of its direction."""
+    assert plan_motion(100, 0, 50, None, 2.0, 1.0) == [MotionPhase(SERVICE_CLOSE_COVER, 0, 0, 0.5)]
+
+
+def test_travel_and_tilt_reverse():
+    """A tilt other than the end of the travel direction takes a reverse run."""
+    assert plan_motion(100, 30, 80, 40, 2.0, 1.0) == [
+        MotionPhase(SERVICE_CLOSE_COVER, 30, 0, pytest.approx(0.8)),
+        MotionPhase(SERVICE_OPEN_COVER, None, 40, 0.0),
+    ]
+
+
+def test_travel_ending_on_the_tilt():
+    """A tilt reached by the travel itself needs no second run."""
+    assert plan_motion(0, 60, 20, 100, 2.0, 1.0) == [MotionPhase(SERVICE_OPEN_COVER, 60, 100, pytest.approx(1.6))]
+
+
+def test_tilt_only():
+    """A tilt alone is one run in its direction."""
+    assert plan_motion(50, 50, 70, 10, 2.0, 1.0) == [MotionPhase(SERVICE_CLOSE_COVER, None, 10, 0.0)]
+    assert plan_motion(50, None, 10, 70, 2.0, 1.0) == [MotionPhase(SERVICE_OPEN_COVER, None, 70, 0.0)]
+
+
+def test_nothing_to_do():
+    """A blind already in place needs no run."""
+    assert plan_motion(50, 50, 30, 30, 2.0, 1.0) == []
+    assert plan_motion(50, None, 30, None, 2.0, 1.0) == []